@@ -6,11 +6,22 @@ cases, essential for maintaining academic integrity in legal scholarship.
 
 import logging
 import re
+import unicodedata
+from collections import Counter
 from dataclasses import dataclass
-from difflib import SequenceMatcher
+from typing import Callable, NamedTuple
+
+try:
+    from rapidfuzz import fuzz
+except ImportError:  # pragma: no cover - optional speedup
+    fuzz = None  # type: ignore[assignment, unused-ignore]
 
 logger = logging.getLogger(__name__)
 
+# Any run of HTML tags and whitespace collapses to one space
+_TAGS_AND_WHITESPACE = re.compile(r"(?:<[^>]+>|\s)+")
+_SMART_QUOTES = str.maketrans({"\u201c": '"', "\u201d": '"', "\u2018": "'", "\u2019": "'"})
+
 
 @dataclass
 class QuoteMatch:
@@ -40,6 +51,118 @@ class QuoteVerificationResult:
     recommendation: str
 
 
+def _indel_similarity_to(text: str) -> Callable[[str], float]:
+    """Build a pure-Python scorer equal to rapidfuzz's ``fuzz.ratio`` / 100.
+
+    Used when rapidfuzz is not installed, so quote matching gives the same
+    scores either way. The similarity is the normalized Indel (insert/delete)
+    similarity, derived from the longest common subsequence (LCS), which is
+    computed with the bit-parallel algorithm of Hyyrö: one big-integer step
+    per candidate character, using bit masks of ``text`` built once here.
+
+    Args:
+        text: Fixed text, e.g. the quote being searched for
+
+    Returns:
+        Function mapping a candidate to its similarity with ``text`` (0 to 1)
+    """
+    char_masks: dict[str, int] = {}
+    for index, char in enumerate(text):
+        char_masks[char] = char_masks.get(char, 0) | 1 << index
+    all_bits = (1 << len(text)) - 1
+
+    def similarity(candidate: str) -> float:
+        total = len(text) + len(candidate)
+        if not total:
+            return 1.0
+        row = all_bits
+        for char in candidate:
+            matched = row & char_masks.get(char, 0)
+            row = ((row + matched) | (row - matched)) & all_bits
+        distance = total - 2 * (len(text) - row.bit_count())
+        # Same arithmetic as rapidfuzz so both backends agree exactly
+        return 100 * (1.0 - distance / total) / 100.0
+
+    return similarity
+
+
+def _word_opcodes(
+    expected: list[str], actual: list[str]
+) -> list[tuple[str, int, int, int, int]]:
+    """Align two word lists and describe how to turn one into the other.
+
+    The alignment is a longest common subsequence of words, computed with the
+    same bit-parallel LCS as ``_indel_similarity_to`` (one big-integer step per
+    word of ``actual``) and walked back from the end. It does not depend on
+    rapidfuzz, so reported differences are the same whatever is installed.
+
+    Args:
+        expected: Words of the quote
+        actual: Words of the matched text
+
+    Returns:
+        difflib-style (tag, i1, i2, j1, j2) opcodes, tags being "equal",
+        "replace", "delete" or "insert"
+    """
+    word_masks: dict[str, int] = {}
+    for index, word in enumerate(expected):
+        word_masks[word] = word_masks.get(word, 0) | 1 << index
+    all_bits = (1 << len(expected)) - 1
+    rows = [all_bits]
+    for word in actual:
+        row = rows[-1]
+        matched = row & word_masks.get(word, 0)
+        rows.append(((row + matched) | (row - matched)) & all_bits)
+
+    def lcs_length(i: int, j: int) -> int:
+        # Zero bits among the first i of row j count the LCS of expected[:i]
+        # and actual[:j]
+        return i - (rows[j] & ((1 << i) - 1)).bit_count()
+
+    matched_pairs: list[tuple[int, int]] = []
+    i, j = len(expected), len(actual)
+    while i and j:
+        if expected[i - 1] == actual[j - 1]:
+            i -= 1
+            j -= 1
+            matched_pairs.append((i, j))
+        elif lcs_length(i - 1, j) == lcs_length(i, j):
+            i -= 1
+        else:
+            j -= 1
+    matched_pairs.reverse()
+
+    opcodes: list[tuple[str, int, int, int, int]] = []
+    i = j = 0
+    for match_i, match_j in [*matched_pairs, (len(expected), len(actual))]:
+        if i < match_i and j < match_j:
+            opcodes.append(("replace", i, match_i, j, match_j))
+        elif i < match_i:
+            opcodes.append(("delete", i, match_i, j, j))
+        elif j < match_j:
+            opcodes.append(("insert", i, i, j, match_j))
+        if match_i == len(expected) and match_j == len(actual):
+            break
+        if opcodes and opcodes[-1][0] == "equal":
+            # Extend the run of equal words this match continues
+            _tag, i1, _i2, j1, _j2 = opcodes[-1]
+            opcodes[-1] = ("equal", i1, match_i + 1, j1, match_j + 1)
+        else:
+            opcodes.append(("equal", match_i, match_i + 1, match_j, match_j + 1))
+        i, j = match_i + 1, match_j + 1
+    return opcodes
+
+
+class _SourceView(NamedTuple):
+    """Normalized forms of a source, computed once per verify_quote call.
+
+    Both matching passes take the view instead of renormalizing the source.
+    """
+
+    normalized: str  # normalize_text() output; match positions refer to this
+    folded: str  # normalized, lowercased for case-insensitive search
+
+
 class QuoteMatcher:
     """Matcher for verifying legal quotes against source text."""
 
@@ -69,19 +192,32 @@ class QuoteMatcher:
         Returns:
             Normalized text
         """
-        # Strip HTML tags if present
-        text = re.sub(r"<[^>]+>", " ", text)
-        # Remove excessive whitespace
-        text = re.sub(r"\s+", " ", text)
-        # Remove line breaks
-        text = text.replace("\n", " ")
-        # Remove smart quotes and replace with standard quotes
-        text = text.replace(""", '"').replace(""", '"')
-        text = text.replace("'", "'").replace("'", "'")
+        # Compose accents so "café" matches with either a precomposed or a
+        # combining é; ASCII and already-NFC text skip the normalization pass
+        if not text.isascii() and not unicodedata.is_normalized("NFC", text):
+            text = unicodedata.normalize("NFC", text)
+        # Replace HTML tags and whitespace runs (including line breaks) with a
+        # single space in one pass
+        text = _TAGS_AND_WHITESPACE.sub(" ", text)
+        # Replace smart quotes with standard quotes
+        if not text.isascii():
+            text = text.translate(_SMART_QUOTES)
         # Strip leading/trailing whitespace
         text = text.strip()
         return text
 
+    def _view(self, text: str) -> _SourceView:
+        """Build the normalized view of a text shared by the matching passes.
+
+        Args:
+            text: Text to view
+
+        Returns:
+            Normalized and case-folded forms of the text
+        """
+        normalized = self.normalize_text(text)
+        return _SourceView(normalized=normalized, folded=normalized.lower())
+
     def normalize_for_fuzzy_match(self, text: str) -> str:
         """Normalize text for fuzzy matching (more aggressive).
 
@@ -91,9 +227,20 @@ class QuoteMatcher:
         Returns:
             Normalized text for fuzzy matching
         """
-        text = self.normalize_text(text)
+        return self._fuzzy_form(self._view(text))
+
+    @staticmethod
+    def _fuzzy_form(view: _SourceView) -> str:
+        """Derive the fuzzy-matching form of a text from its normalized view.
+
+        Args:
+            view: Normalized view of the text
+
+        Returns:
+            Normalized text for fuzzy matching
+        """
         # Case insensitive for fuzzy matching
-        text = text.lower()
+        text = view.folded
         # Remove punctuation variations
         text = re.sub(r'[""''`]', '"', text)
         # Normalize ellipsis
@@ -110,35 +257,87 @@ class QuoteMatcher:
         Returns:
             Similarity score from 0 to 1
         """
-        return SequenceMatcher(None, text1, text2).ratio()
+        if fuzz is not None:
+            # Indel-normalized ratio computed with rapidfuzz's bit-parallel LCS
+            return float(fuzz.ratio(text1, text2)) / 100.0
+        return _indel_similarity_to(text1)(text2)
+
+    def _similarity_to(self, text: str, min_similarity: float) -> Callable[[str], float]:
+        """Build a scorer comparing candidate strings against one text.
+
+        Candidates scoring below ``min_similarity`` may be reported as 0.0, which
+        lets rapidfuzz stop scoring them early.
+
+        Args:
+            text: Fixed text, e.g. the quote being searched for
+            min_similarity: Lowest similarity the caller is interested in
+
+        Returns:
+            Function mapping a candidate to its similarity with ``text`` (0 to 1)
+        """
+        if fuzz is None:
+            return _indel_similarity_to(text)
+
+        # Slightly below the threshold so float rounding of threshold * 100 never
+        # cuts off a candidate the caller would accept
+        score_cutoff = max(0.0, min_similarity * 100 - 1e-6)
+
+        def similarity(candidate: str) -> float:
+            return float(fuzz.ratio(text, candidate, score_cutoff=score_cutoff)) / 100.0
+
+        return similarity
 
-    def find_quote_exact(self, quote: str, source: str) -> list[QuoteMatch]:
+    def find_quote_exact(
+        self,
+        quote: str,
+        source: str,
+        source_view: _SourceView | None = None,
+    ) -> list[QuoteMatch]:
         """Find exact matches of quote in source text.
 
         Args:
             quote: Quote to search for
             source: Source text to search in
+            source_view: Normalized view of ``source``, if already computed
 
         Returns:
             List of exact matches found
         """
-        matches = []
+        matches: list[QuoteMatch] = []
 
         # Normalize both texts but preserve source structure
-        normalized_quote = self.normalize_text(quote)
-        normalized_source = self.normalize_text(source)
-
-        # Search for exact matches (case-sensitive)
-        pattern = re.escape(normalized_quote)
-        for match in re.finditer(pattern, normalized_source, re.IGNORECASE):
-            position = match.start()
-
+        normalized_quote, folded_quote = self._view(quote)
+        normalized_source, folded_source = source_view or self._view(source)
+
+        if not normalized_quote:
+            return matches
+
+        # Case-insensitive search with str.find on the lowered forms; lower() keeps
+        # positions aligned unless it changes the length, e.g. for "İ"
+        if len(folded_quote) != len(normalized_quote) or len(folded_source) != len(
+            normalized_source
+        ):
+            spans = [
+                match.span()
+                for match in re.finditer(
+                    re.escape(normalized_quote), normalized_source, re.IGNORECASE
+                )
+            ]
+        else:
+            spans = []
+            quote_len = len(folded_quote)
+            position = folded_source.find(folded_quote)
+            while position != -1:
+                spans.append((position, position + quote_len))
+                position = folded_source.find(folded_quote, position + quote_len)
+
+        for position, end in spans:
             # Extract context
             context_start = max(0, position - self.context_chars)
-            context_end = min(len(normalized_source), match.end() + self.context_chars)
+            context_end = min(len(normalized_source), end + self.context_chars)
 
             context_before = normalized_source[context_start:position]
-            context_after = normalized_source[match.end():context_end]
+            context_after = normalized_source[end:context_end]
 
             matches.append(
                 QuoteMatch(
@@ -146,7 +345,7 @@ class QuoteMatcher:
                     exact_match=True,
                     similarity=1.0,
                     position=position,
-                    matched_text=match.group(),
+                    matched_text=normalized_source[position:end],
                     context_before=context_before,
                     context_after=context_after,
                     differences=[],
@@ -160,6 +359,7 @@ class QuoteMatcher:
         quote: str,
         source: str,
         max_matches: int = 5,
+        source_view: _SourceView | None = None,
     ) -> list[QuoteMatch]:
         """Find fuzzy matches of quote in source text.
 
@@ -169,12 +369,13 @@ class QuoteMatcher:
             quote: Quote to search for
             source: Source text to search in
             max_matches: Maximum number of fuzzy matches to return
+            source_view: Normalized view of ``source``, if already computed
 
         Returns:
             List of fuzzy matches found, sorted by similarity
         """
         normalized_quote = self.normalize_for_fuzzy_match(quote)
-        normalized_source = self.normalize_for_fuzzy_match(source)
+        normalized_source = self._fuzzy_form(source_view or self._view(source))
 
         quote_len = len(normalized_quote)
         source_len = len(normalized_source)
@@ -188,15 +389,38 @@ class QuoteMatcher:
         window_size = quote_len
         tolerance = int(quote_len * 0.2)  # Allow 20% size variation
 
+        # Characters shared with the quote bound any alignment-based similarity
+        # from above (2 * shared / total), so windows that cannot reach the
+        # threshold are skipped without running the similarity scorer
+        quote_counts = Counter(normalized_quote)
+        min_size = max(window_size - tolerance, 1)
+        similarity_to_quote = self._similarity_to(normalized_quote, self.fuzzy_threshold)
+
         for start in range(0, source_len - window_size + tolerance + 1, max(1, quote_len // 4)):
-            for size in range(
-                max(window_size - tolerance, 1),
-                min(window_size + tolerance, source_len - start) + 1,
-            ):
+            max_size = min(window_size + tolerance, source_len - start)
+            if max_size < min_size:
+                continue
+
+            window_counts = Counter(normalized_source[start:start + min_size])
+            shared = sum(
+                min(count, window_counts[char]) for char, count in quote_counts.items()
+            )
+
+            for size in range(min_size, max_size + 1):
                 end = start + size
+                if size > min_size:
+                    # Grow the window by one character and update the overlap
+                    char = normalized_source[end - 1]
+                    if window_counts[char] < quote_counts[char]:
+                        shared += 1
+                    window_counts[char] += 1
+
+                if 2.0 * shared / (quote_len + size) < self.fuzzy_threshold:
+                    continue
+
                 window = normalized_source[start:end]
 
-                similarity = self.calculate_similarity(normalized_quote, window)
+                similarity = similarity_to_quote(window)
 
                 if similarity >= self.fuzzy_threshold:
                     # Get the original text (not normalized)
@@ -253,8 +477,8 @@ class QuoteMatcher:
         differences = []
 
         # Normalize for comparison
-        norm_expected = self.normalize_text(expected)
-        norm_actual = self.normalize_text(actual)
+        norm_expected = self._view(expected).normalized
+        norm_actual = self._view(actual).normalized
 
         # Check length difference
         len_diff = abs(len(norm_expected) - len(norm_actual))
@@ -269,8 +493,7 @@ class QuoteMatcher:
             differences.append(f"Word count differs by {word_diff} words")
 
         # Find mismatched words
-        matcher = SequenceMatcher(None, expected_words, actual_words)
-        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        for tag, i1, i2, j1, j2 in _word_opcodes(expected_words, actual_words):
             if tag == "replace":
                 differences.append(
                     f"Words differ: '{' '.join(expected_words[i1:i2])}' vs '{' '.join(actual_words[j1:j2])}'"
@@ -313,8 +536,11 @@ class QuoteMatcher:
 
         logger.info(f"Verifying quote ({len(quote)} chars) against source ({len(source)} chars)")
 
+        # Normalize the source once for both passes
+        source_view = self._view(source)
+
         # First try exact match
-        exact_matches = self.find_quote_exact(quote, source)
+        exact_matches = self.find_quote_exact(quote, source, source_view=source_view)
 
         if exact_matches:
             logger.info(f"Found {len(exact_matches)} exact match(es)")
@@ -331,7 +557,7 @@ class QuoteMatcher:
 
         # If no exact match, try fuzzy matching
         logger.info("No exact match, attempting fuzzy match...")
-        fuzzy_matches = self.find_quote_fuzzy(quote, source)
+        fuzzy_matches = self.find_quote_fuzzy(quote, source, source_view=source_view)
 
         if fuzzy_matches:
             best_match = fuzzy_matches[0]
@@ -6,10 +6,14 @@ This module analyzes how citing cases treat a target case, classifying treatment
 - Neutral: Case is cited without clear positive or negative treatment
 """
 
+import hashlib
 import logging
 import re
+from collections import OrderedDict
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
+from typing import cast
 
 from app.types import CourtListenerCase
 
@@ -25,7 +29,7 @@ class TreatmentType(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TreatmentSignal:
     """A treatment signal found in text."""
 
@@ -35,7 +39,7 @@ class TreatmentSignal:
     context: str
 
 
-@dataclass
+@dataclass(slots=True)
 class TreatmentAnalysis:
     """Analysis of treatment for a single citing case."""
 
@@ -98,20 +102,126 @@ POSITIVE_SIGNALS = {
     r"\bconfirmed\b": ("confirmed", 0.85),
 }
 
+# Signal name -> weight, for constant-time lookups when ranking signals
+_NEGATIVE_WEIGHTS = {signal: weight for signal, weight in NEGATIVE_SIGNALS.values()}
+_POSITIVE_WEIGHTS = {signal: weight for signal, weight in POSITIVE_SIGNALS.values()}
+
+
+def _compile_signal_pattern() -> tuple[
+    re.Pattern[str], dict[str, tuple[str, TreatmentType]], dict[str, int]
+]:
+    """Union every signal pattern into one alternation of named branches.
+
+    Returns:
+        Tuple of (compiled pattern, branch name -> (signal, treatment type),
+        signal -> rank in the signal tables, negative signals first)
+    """
+    branch_signals: dict[str, tuple[str, TreatmentType]] = {}
+    signal_ranks: dict[str, int] = {}
+    branches: list[str] = []
+    for treatment_type, signal_table in (
+        (TreatmentType.NEGATIVE, NEGATIVE_SIGNALS),
+        (TreatmentType.POSITIVE, POSITIVE_SIGNALS),
+    ):
+        for pattern, (signal, _weight) in signal_table.items():
+            group = f"s{len(branches)}"
+            branches.append(f"(?P<{group}>{pattern})")
+            branch_signals[group] = (signal, treatment_type)
+            signal_ranks.setdefault(signal, len(signal_ranks))
+    return re.compile("|".join(branches), re.IGNORECASE), branch_signals, signal_ranks
+
+
+# Compiled once at import and shared by every classifier instance; a context is
+# scanned once and the branch that matched identifies the signal.
+_SIGNAL_PATTERN, _SIGNAL_BRANCHES, _SIGNAL_RANKS = _compile_signal_pattern()
+
+# A negation directly governing a "followed" signal: "not followed", "never been
+# followed", "wasn't followed". Anchored at the verb, so "not only been followed"
+# or "did not hesitate (and) followed" stay positive.
+_NEGATED_VERB = re.compile(r"(?:\b(?:not|never)|n't)\s+(?:been\s+)?$", re.IGNORECASE)
+_NEGATION_WINDOW = 24
+
+
+def _is_negated(text: str, position: int) -> bool:
+    """Check whether a negation sits directly before the verb at ``position``.
+
+    Args:
+        text: Text containing the signal
+        position: Start of the signal in ``text``
+
+    Returns:
+        True if "not", "never" or "n't" (optionally followed by "been") ends
+        right where the signal starts
+    """
+    start = max(0, position - _NEGATION_WINDOW)
+    return _NEGATED_VERB.search(text, start, position) is not None
+
+
+# Case names searched alongside well-known citations, since signals often sit
+# near the case name rather than the citation (e.g. "Roe v. Wade" for 410 U.S. 113)
+_WELL_KNOWN_CASE_NAMES = {
+    "410 U.S. 113": "Roe v. Wade",
+    "539 U.S. 558": "Lawrence v. Texas",
+    "505 U.S. 833": "Planned Parenthood v. Casey",
+}
+
+
+@lru_cache(maxsize=512)
+def _compile_citation_pattern(citation: str) -> re.Pattern[str]:
+    """Compile one pattern matching a citation or its well-known case name.
+
+    Spaces in either needle match any run of whitespace. The citation is
+    captured as group 1 and the case name, when there is one, as group 2.
+
+    Args:
+        citation: Citation to find
+
+    Returns:
+        Compiled case-insensitive pattern
+    """
+    needles = [citation]
+    if citation in _WELL_KNOWN_CASE_NAMES:
+        needles.append(_WELL_KNOWN_CASE_NAMES[citation])
+    branches = ("(" + re.escape(needle).replace(r"\ ", r"\s+") + ")" for needle in needles)
+    return re.compile("|".join(branches), re.IGNORECASE)
+
+
+# (strategy, snippet treatment type) -> whether to fetch full text. None means the
+# decision depends on the analysis confidence.
+_FULL_TEXT_FETCH: dict[tuple[str, TreatmentType], bool | None] = {
+    **{("always", treatment_type): True for treatment_type in TreatmentType},
+    **{("never", treatment_type): False for treatment_type in TreatmentType},
+    **{
+        ("negative_only", treatment_type): treatment_type == TreatmentType.NEGATIVE
+        for treatment_type in TreatmentType
+    },
+    # 'smart' always fetches for negative signals (high priority) and unknown
+    # treatment (needs more context); otherwise only when confidence is low
+    **{
+        ("smart", treatment_type): (
+            True if treatment_type in (TreatmentType.NEGATIVE, TreatmentType.UNKNOWN) else None
+        )
+        for treatment_type in TreatmentType
+    },
+}
+
 
 class TreatmentClassifier:
     """Classifier for determining how cases treat other cases."""
 
-    def __init__(self) -> None:
-        """Initialize the treatment classifier."""
-        self.negative_patterns = {
-            re.compile(pattern, re.IGNORECASE): (signal, weight)
-            for pattern, (signal, weight) in NEGATIVE_SIGNALS.items()
-        }
-        self.positive_patterns = {
-            re.compile(pattern, re.IGNORECASE): (signal, weight)
-            for pattern, (signal, weight) in POSITIVE_SIGNALS.items()
-        }
+    def __init__(self, cache_size: int = 256) -> None:
+        """Initialize the treatment classifier.
+
+        Args:
+            cache_size: Number of (text, citation) analyses memoized per classifier;
+                repeat queries re-classify the same snippets and opinions
+        """
+        self._cache_size = cache_size
+        # Keyed by a digest of the text so cached entries do not keep whole
+        # opinions alive; the cached results only hold short excerpts
+        self._analyses: OrderedDict[
+            tuple[bytes, str], tuple[tuple[TreatmentSignal, ...], TreatmentType, float, str]
+        ] = OrderedDict()
 
     def should_fetch_full_text(
         self,
@@ -127,27 +237,11 @@ class TreatmentClassifier:
         Returns:
             True if full text should be fetched
         """
-        if strategy == "never":
-            return False
-
-        if strategy == "always":
-            return True
-
-        if strategy == "negative_only":
-            return initial_analysis.treatment_type == TreatmentType.NEGATIVE
-
-        if strategy == "smart":
-            # Fetch if:
-            # 1. Negative signals found (high priority)
-            # 2. Low confidence (ambiguous)
-            # 3. Unknown treatment (needs more context)
-            return (
-                initial_analysis.treatment_type == TreatmentType.NEGATIVE
-                or initial_analysis.confidence < 0.6
-                or initial_analysis.treatment_type == TreatmentType.UNKNOWN
-            )
-
-        return False
+        decision = _FULL_TEXT_FETCH.get((strategy, initial_analysis.treatment_type), False)
+        if decision is None:
+            # Ambiguous snippet analysis: fetch only when confidence is low
+            return initial_analysis.confidence < 0.6
+        return decision
 
     def extract_signals(self, text: str, citation: str) -> list[TreatmentSignal]:
         """Extract treatment signals from text mentioning the citation.
@@ -165,29 +259,30 @@ class TreatmentClassifier:
         contexts = self._extract_citation_contexts(text, citation)
 
         for context, position in contexts:
-            # Check for negative signals
-            for pattern, (signal, weight) in self.negative_patterns.items():
-                if pattern.search(context):
-                    signals.append(
-                        TreatmentSignal(
-                            signal=signal,
-                            treatment_type=TreatmentType.NEGATIVE,
-                            position=position,
-                            context=context[:200],  # First 200 chars
-                        )
-                    )
-
-            # Check for positive signals
-            for pattern, (signal, weight) in self.positive_patterns.items():
-                if pattern.search(context):
-                    signals.append(
-                        TreatmentSignal(
-                            signal=signal,
-                            treatment_type=TreatmentType.POSITIVE,
-                            position=position,
-                            context=context[:200],
-                        )
+            # Matches are leftmost and non-overlapping, so "not followed" is reported as
+            # a single negative signal rather than also as a positive "followed".
+            seen: set[str] = set()
+            context_signals: list[TreatmentSignal] = []
+            for match in _SIGNAL_PATTERN.finditer(context):
+                signal, treatment_type = _SIGNAL_BRANCHES[cast(str, match.lastgroup)]
+                if signal == "followed" and _is_negated(context, match.start()):
+                    # e.g. "has not been followed", "was never followed"
+                    signal, treatment_type = "not followed", TreatmentType.NEGATIVE
+                if signal in seen:
+                    continue
+                seen.add(signal)
+                context_signals.append(
+                    TreatmentSignal(
+                        signal=signal,
+                        treatment_type=treatment_type,
+                        position=position,
+                        context=context[:200],  # First 200 chars
                     )
+                )
+            # Report in signal-table order (negatives first) rather than text order,
+            # so ties between equally weighted signals resolve as they always have
+            context_signals.sort(key=lambda s: _SIGNAL_RANKS[s.signal])
+            signals.extend(context_signals)
 
         return signals
 
@@ -238,14 +333,7 @@ class TreatmentClassifier:
             text = "\n\n".join(text_parts) if text_parts else ""
             logger.debug(f"Using snippet text ({len(text)} chars) for analysis")
 
-        # Extract signals
-        signals = self.extract_signals(text, target_citation)
-
-        # Classify based on signals
-        treatment_type, confidence = self._aggregate_signals(signals)
-
-        # Extract excerpt containing the citation
-        excerpt = self._extract_best_excerpt(text, target_citation, signals)
+        signals, treatment_type, confidence, excerpt = self._analyze_text(text, target_citation)
 
         return TreatmentAnalysis(
             case_name=citing_case.get("caseName", "Unknown"),
@@ -253,11 +341,63 @@ class TreatmentClassifier:
             citation=citing_case.get("citation", [""])[0] if citing_case.get("citation") else "",
             treatment_type=treatment_type,
             confidence=confidence,
-            signals_found=signals,
+            signals_found=list(signals),
             excerpt=excerpt,
             date_filed=citing_case.get("dateFiled"),
         )
 
+    def _analyze_text(
+        self,
+        text: str,
+        target_citation: str,
+    ) -> tuple[tuple[TreatmentSignal, ...], TreatmentType, float, str]:
+        """Analyze a text, reusing the result of a recent identical analysis.
+
+        Args:
+            text: Text to analyze
+            target_citation: The citation being analyzed
+
+        Returns:
+            Tuple of (signals, treatment_type, confidence, excerpt)
+        """
+        key = (hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest(), target_citation)
+        cached = self._analyses.get(key)
+        if cached is not None:
+            self._analyses.move_to_end(key)
+            return cached
+
+        result = self._analyze_text_uncached(text, target_citation)
+        if self._cache_size > 0:
+            self._analyses[key] = result
+            if len(self._analyses) > self._cache_size:
+                self._analyses.popitem(last=False)
+        return result
+
+    def _analyze_text_uncached(
+        self,
+        text: str,
+        target_citation: str,
+    ) -> tuple[tuple[TreatmentSignal, ...], TreatmentType, float, str]:
+        """Extract, classify and excerpt the treatment signals in one text.
+
+        Args:
+            text: Text to analyze
+            target_citation: The citation being analyzed
+
+        Returns:
+            Tuple of (signals, treatment_type, confidence, excerpt)
+        """
+        # Extract signals
+        signals = self.extract_signals(text, target_citation)
+
+        # Classify based on signals
+        treatment_type, confidence = self._aggregate_signals(signals)
+
+        # Extract excerpt containing the citation
+        excerpt = self._extract_best_excerpt(text, target_citation, signals)
+
+        return tuple(signals), treatment_type, confidence, excerpt
+
     def aggregate_treatments(
         self,
         treatments: list[TreatmentAnalysis],
@@ -272,21 +412,24 @@ class TreatmentClassifier:
         Returns:
             Aggregated treatment assessment
         """
-        positive_count = sum(1 for t in treatments if t.treatment_type == TreatmentType.POSITIVE)
-        negative_count = sum(1 for t in treatments if t.treatment_type == TreatmentType.NEGATIVE)
-        neutral_count = sum(1 for t in treatments if t.treatment_type == TreatmentType.NEUTRAL)
-        unknown_count = sum(1 for t in treatments if t.treatment_type == TreatmentType.UNKNOWN)
+        # Bucket the treatments by type in a single pass
+        by_type: dict[TreatmentType, list[TreatmentAnalysis]] = {
+            treatment_type: [] for treatment_type in TreatmentType
+        }
+        for treatment in treatments:
+            by_type[treatment.treatment_type].append(treatment)
 
-        # Separate negative and positive treatments
-        negative_treatments = [t for t in treatments if t.treatment_type == TreatmentType.NEGATIVE]
-        positive_treatments = [t for t in treatments if t.treatment_type == TreatmentType.POSITIVE]
+        negative_treatments = by_type[TreatmentType.NEGATIVE]
+        positive_treatments = by_type[TreatmentType.POSITIVE]
+
+        positive_count = len(positive_treatments)
+        negative_count = len(negative_treatments)
+        neutral_count = len(by_type[TreatmentType.NEUTRAL])
+        unknown_count = len(by_type[TreatmentType.UNKNOWN])
 
         # Determine if case is still good law
         # Any high-confidence negative treatment is a red flag
-        critical_negative = any(
-            t.confidence >= 0.8 and t.treatment_type == TreatmentType.NEGATIVE
-            for t in treatments
-        )
+        critical_negative = any(t.confidence >= 0.8 for t in negative_treatments)
 
         is_good_law = not critical_negative
 
@@ -343,38 +486,17 @@ class TreatmentClassifier:
         Returns:
             List of (context, position) tuples
         """
-        contexts = []
-
-        # Try multiple citation patterns to find all mentions
-        # Pattern 1: Direct citation (e.g., "410 U.S. 113")
-        citation_pattern = re.escape(citation).replace(r"\ ", r"\s+")
-        patterns_to_try = [
-            re.compile(citation_pattern, re.IGNORECASE),
-        ]
-
-        # Pattern 2: If citation is "XXX U.S. YYY", also try case name
-        # (e.g., for "410 U.S. 113", also search for "Roe v. Wade")
-        # This helps when signals are near case name but before citation
-        us_cite_match = re.match(r"(\d+)\s+U\.?S\.?\s+(\d+)", citation, re.IGNORECASE)
-        if us_cite_match:
-            # Add pattern for common case names associated with this citation
-            well_known_cases = {
-                "410 U.S. 113": "Roe v. Wade",
-                "539 U.S. 558": "Lawrence v. Texas",
-                "505 U.S. 833": "Planned Parenthood v. Casey",
-            }
-            if citation in well_known_cases:
-                case_name = well_known_cases[citation]
-                patterns_to_try.append(
-                    re.compile(re.escape(case_name).replace(r"\ ", r"\s+"), re.IGNORECASE)
-                )
+        # One scan finds every needle; citation mentions are listed before
+        # case-name mentions, as the citation is the stronger anchor
+        pattern = _compile_citation_pattern(citation)
+        found = sorted(pattern.finditer(text), key=lambda match: match.lastindex or 0)
 
-        for pattern in patterns_to_try:
-            for match in pattern.finditer(text):
-                start = max(0, match.start() - window)
-                end = min(len(text), match.end() + window)
-                context = text[start:end]
-                contexts.append((context, match.start()))
+        contexts = []
+        for match in found:
+            start = max(0, match.start() - window)
+            end = min(len(text), match.end() + window)
+            context = text[start:end]
+            contexts.append((context, match.start()))
 
         return contexts if contexts else [(text[:500], 0)]  # Fallback to beginning
 
@@ -426,15 +548,10 @@ class TreatmentClassifier:
         Returns:
             Weight between 0 and 1
         """
-        signals_dict = (
-            NEGATIVE_SIGNALS if treatment_type == TreatmentType.NEGATIVE else POSITIVE_SIGNALS
+        weights = (
+            _NEGATIVE_WEIGHTS if treatment_type == TreatmentType.NEGATIVE else _POSITIVE_WEIGHTS
         )
-
-        for pattern_text, (sig, weight) in signals_dict.items():
-            if sig == signal:
-                return weight
-
-        return 0.5
+        return weights.get(signal, 0.5)
 
     def _extract_best_excerpt(
         self,
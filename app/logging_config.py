@@ -3,16 +3,21 @@
 from __future__ import annotations
 
 import asyncio
+import itertools
 import json
 import logging
+import os
 import time
-import uuid
-from contextvars import ContextVar, Token
-from datetime import UTC, datetime
+from contextvars import ContextVar, Token, copy_context
 from functools import wraps
-from inspect import Signature, signature
+from inspect import Parameter, Signature, signature
 from typing import Any, Awaitable, Callable, ParamSpec, TypeVar, cast
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore[assignment]
+
 correlation_id_ctx: ContextVar[str | None] = ContextVar("correlation_id", default=None)
 request_metadata_ctx: ContextVar[dict[str, Any]] = ContextVar("request_metadata", default={})
 
@@ -20,22 +25,91 @@ P = ParamSpec("P")
 R = TypeVar("R")
 
 
+def _new_correlation_prefix() -> str:
+    return f"{os.getpid():x}-{int(time.time()):x}-"
+
+
+# Correlation IDs are a per-process prefix (PID + start time) plus a counter, which keeps
+# them unique without an os.urandom read and UUID construction on every tool call.
+_correlation_prefix = _new_correlation_prefix()
+_next_correlation_seq = itertools.count().__next__
+
+
+def _reset_correlation_prefix() -> None:
+    global _correlation_prefix
+    _correlation_prefix = _new_correlation_prefix()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_correlation_prefix)
+
+# Attributes every LogRecord carries; anything else on a record came in via ``extra``.
+_STANDARD_RECORD_ATTRS = frozenset(
+    vars(logging.LogRecord("", logging.NOTSET, "", 0, "", (), None))
+) | {"message", "asctime"}
+
+
+def _dumps(payload: dict[str, Any]) -> str:
+    """Serialize a log payload, preferring orjson when it is installed."""
+
+    if orjson is not None:
+        return orjson.dumps(payload, default=str, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+def _dumps_line(payload: dict[str, Any]) -> bytes:
+    """Serialize a log payload to a newline-terminated UTF-8 JSON line."""
+
+    if orjson is not None:
+        return orjson.dumps(
+            payload,
+            default=str,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE,
+        )
+    return (json.dumps(payload, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+
+
 class JsonFormatter(logging.Formatter):
     """Format log records as structured JSON with contextual metadata."""
 
-    def format(self, record: logging.LogRecord) -> str:  # pragma: no cover - formatting logic
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        # Bound once so each record skips the global + attribute lookups
+        self._get_correlation_id = correlation_id_ctx.get
+        self._get_metadata = request_metadata_ctx.get
+        # Records arrive in bursts within the same second; only the fraction changes
+        self._timestamp_second = -1
+        self._timestamp_prefix = ""
+
+    def format(self, record: logging.LogRecord) -> str:
+        return _dumps(self._build_payload(record))
+
+    def format_bytes(self, record: logging.LogRecord) -> bytes:
+        """Format a record as a newline-terminated UTF-8 JSON line, skipping the str round-trip."""
+        return _dumps_line(self._build_payload(record))
+
+    def _timestamp(self, created: float) -> str:
+        """Render ``created`` as an ISO 8601 UTC timestamp, reusing the per-second prefix."""
+        second = int(created)
+        if second != self._timestamp_second:
+            self._timestamp_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+            self._timestamp_second = second
+        microsecond = int((created - second) * 1_000_000)
+        return f"{self._timestamp_prefix}.{microsecond:06d}+00:00"
+
+    def _build_payload(self, record: logging.LogRecord) -> dict[str, Any]:  # pragma: no cover - formatting logic
         log_record: dict[str, Any] = {
-            "timestamp": datetime.now(UTC).isoformat(),
+            "timestamp": self._timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
         }
 
-        correlation_id = correlation_id_ctx.get()
+        correlation_id = self._get_correlation_id()
         if correlation_id:
             log_record["correlation_id"] = correlation_id
 
-        metadata = request_metadata_ctx.get()
+        metadata = self._get_metadata()
         if metadata:
             tool_name = metadata.get("tool_name")
             if tool_name:
@@ -44,20 +118,112 @@ class JsonFormatter(logging.Formatter):
             if citation:
                 log_record["citation"] = citation
 
-        for field in (
-            "elapsed_ms",
-            "event",
-            "query_params",
-            "citation_count",
-        ):
-            value = getattr(record, field, None)
-            if value is not None:
-                log_record[field] = value
+        for key, value in record.__dict__.items():
+            if key not in _STANDARD_RECORD_ATTRS and value is not None:
+                log_record[key] = value
 
         if record.exc_info:
             log_record["exception"] = self.formatException(record.exc_info)
 
-        return json.dumps(log_record, ensure_ascii=False)
+        return log_record
+
+
+class BufferedStreamHandler(logging.StreamHandler):  # type: ignore[type-arg]
+    """Stream handler that formats records immediately but batches the writes.
+
+    Records are formatted on emit so context variables (correlation ID, tool
+    metadata) are captured while they are still set. The formatted lines are
+    written to the stream in one call once ``capacity`` lines are pending, a
+    record at ``flush_level`` or above arrives, or a record arrives when the
+    oldest pending line has waited ``max_delay`` seconds, so a quiet server does
+    not sit on its output. Interactive (TTY) streams are written on every record.
+    ``logging.shutdown`` flushes any remainder at interpreter exit.
+
+    When the stream exposes a binary ``buffer`` (as ``sys.stderr`` does), lines
+    are kept as bytes and written straight to it; a ``JsonFormatter`` then hands
+    over its serialized bytes without decoding and re-encoding them.
+    """
+
+    def __init__(
+        self,
+        stream: Any = None,
+        *,
+        capacity: int = 512,
+        flush_level: int = logging.WARNING,
+        max_delay: float = 1.0,
+    ) -> None:
+        super().__init__(stream)
+        self.capacity = capacity
+        self.flush_level = flush_level
+        self.max_delay = max_delay
+        self._pending: list[Any] = []
+        self._oldest_pending = 0.0  # time.monotonic() when _pending[0] was added
+        self._buffer: Any = getattr(self.stream, "buffer", None)
+        self._interactive = self._is_tty(self.stream)
+
+    @staticmethod
+    def _is_tty(stream: Any) -> bool:
+        try:
+            return bool(stream.isatty())
+        except (AttributeError, ValueError):  # no isatty, or a closed stream
+            return False
+
+    def setStream(self, stream: Any) -> Any:  # noqa: N802
+        self.flush()
+        previous = super().setStream(stream)
+        self._buffer = getattr(self.stream, "buffer", None)
+        self._interactive = self._is_tty(self.stream)
+        return previous
+
+    def _format_line(self, record: logging.LogRecord) -> Any:
+        if self._buffer is None:
+            return self.format(record) + self.terminator
+        if isinstance(self.formatter, JsonFormatter):
+            return self.formatter.format_bytes(record)
+        line = self.format(record) + self.terminator
+        return line.encode(
+            getattr(self.stream, "encoding", None) or "utf-8",
+            getattr(self.stream, "errors", None) or "strict",
+        )
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            now = time.monotonic()
+            if not self._pending:
+                self._oldest_pending = now
+            self._pending.append(self._format_line(record))
+            if (
+                self._interactive
+                or len(self._pending) >= self.capacity
+                or record.levelno >= self.flush_level
+                or now - self._oldest_pending >= self.max_delay
+            ):
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        self.acquire()
+        try:
+            if self._pending:
+                if self._buffer is None:
+                    self.stream.write("".join(self._pending))
+                else:
+                    # Push out anything written through the text layer first to keep ordering
+                    self.stream.flush()
+                    self._buffer.write(b"".join(self._pending))
+                self._pending.clear()
+            super().flush()
+        finally:
+            self.release()
+
+    def close(self) -> None:
+        # logging.Handler.close drops the handler from the shutdown flush list,
+        # so write out pending lines first or they are lost
+        try:
+            self.flush()
+        finally:
+            super().close()
 
 
 def configure_logging(log_level: str, log_format: str, date_format: str | None = None) -> None:
@@ -66,24 +232,64 @@ def configure_logging(log_level: str, log_format: str, date_format: str | None =
     root_logger = logging.getLogger()
     root_logger.setLevel(getattr(logging, log_level.upper(), logging.INFO))
 
-    handler = logging.StreamHandler()
+    handler = BufferedStreamHandler()
     if log_format.lower() == "json":
         formatter: logging.Formatter = JsonFormatter()
     else:
         formatter = logging.Formatter(fmt=log_format, datefmt=date_format)
     handler.setFormatter(formatter)
 
+    # Write out anything the previous handlers still hold, then close them so
+    # they release their resources before they are dropped.
+    for existing in root_logger.handlers:
+        existing.flush()
+        existing.close()
     root_logger.handlers = [handler]
 
 
-def _bind_context(tool_name: str, call_signature: Signature, args: tuple[Any, ...], kwargs: dict[str, Any]) -> tuple[Token[Any], Token[Any]]:
-    correlation_token = correlation_id_ctx.set(str(uuid.uuid4()))
+# Argument names that carry the citation a tool is working on, in priority order.
+_CITATION_ARG_NAMES = ("citation", "citation_id", "citation_text")
+
+# (argument name, positional index or None if keyword-only, default value)
+_CitationLookup = tuple[tuple[str, int | None, Any], ...]
+
+
+def _citation_lookup(call_signature: Signature) -> _CitationLookup:
+    """Precompute where each citation-like argument sits in a tool's signature."""
+
+    positions: dict[str, tuple[str, int | None, Any]] = {}
+    for index, (name, parameter) in enumerate(call_signature.parameters.items()):
+        if name not in _CITATION_ARG_NAMES:
+            continue
+        positional = parameter.kind in (
+            Parameter.POSITIONAL_ONLY,
+            Parameter.POSITIONAL_OR_KEYWORD,
+        )
+        default = None if parameter.default is Parameter.empty else parameter.default
+        positions[name] = (name, index if positional else None, default)
+    return tuple(positions[name] for name in _CITATION_ARG_NAMES if name in positions)
+
 
-    bound = call_signature.bind_partial(*args, **kwargs)
-    bound.apply_defaults()
+def _find_citation(
+    citation_lookup: _CitationLookup, args: tuple[Any, ...], kwargs: dict[str, Any]
+) -> Any:
+    for name, index, default in citation_lookup:
+        if name in kwargs:
+            value = kwargs[name]
+        elif index is not None and index < len(args):
+            value = args[index]
+        else:
+            value = default
+        if value:
+            return value
+    return None
+
+
+def _bind_context(tool_name: str, citation_lookup: _CitationLookup, args: tuple[Any, ...], kwargs: dict[str, Any]) -> tuple[Token[Any], Token[Any]]:
+    correlation_token = correlation_id_ctx.set(f"{_correlation_prefix}{_next_correlation_seq():x}")
 
-    citation = bound.arguments.get("citation") or bound.arguments.get("citation_id") or bound.arguments.get("citation_text")
     metadata: dict[str, Any] = {"tool_name": tool_name}
+    citation = _find_citation(citation_lookup, args, kwargs) if citation_lookup else None
     if citation is not None:
         metadata["citation"] = citation
 
@@ -95,7 +301,7 @@ def tool_logging(tool_name: str) -> Callable[[Callable[P, object]], Callable[P,
     """Decorator to add correlation IDs and structured entry/exit logging for MCP tools."""
 
     def decorator(func: Callable[P, object]) -> Callable[P, object | Awaitable[object]]:
-        call_signature = signature(func)
+        citation_lookup = _citation_lookup(signature(func))
         logger = logging.getLogger(func.__module__)
 
         if asyncio.iscoroutinefunction(func):
@@ -103,16 +309,16 @@ def tool_logging(tool_name: str) -> Callable[[Callable[P, object]], Callable[P,
 
             @wraps(func)
             async def async_wrapper(*args: P.args, **kwargs: P.kwargs) -> object:
-                correlation_token, metadata_token = _bind_context(tool_name, call_signature, args, kwargs)
-                start = time.perf_counter()
+                correlation_token, metadata_token = _bind_context(tool_name, citation_lookup, args, kwargs)
+                start_ns = time.perf_counter_ns()
                 logger.info("Tool call started", extra={"event": "tool_start"})
                 try:
                     result = await async_func(*args, **kwargs)
-                    elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
+                    elapsed_ms = round((time.perf_counter_ns() - start_ns) / 1_000_000, 2)
                     logger.info("Tool call completed", extra={"event": "tool_end", "elapsed_ms": elapsed_ms})
                     return result
                 except Exception:
-                    elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
+                    elapsed_ms = round((time.perf_counter_ns() - start_ns) / 1_000_000, 2)
                     logger.exception(
                         "Tool call failed",
                         extra={"event": "tool_error", "elapsed_ms": elapsed_ms},
@@ -126,26 +332,28 @@ def tool_logging(tool_name: str) -> Callable[[Callable[P, object]], Callable[P,
 
         sync_func = func
 
-        @wraps(func)
-        def sync_wrapper(*args: P.args, **kwargs: P.kwargs) -> object:
-            correlation_token, metadata_token = _bind_context(tool_name, call_signature, args, kwargs)
-            start = time.perf_counter()
+        def run_sync(args: tuple[Any, ...], kwargs: dict[str, Any]) -> object:
+            # Runs inside a copied context, so the bindings are discarded on return
+            # and never need resetting.
+            _bind_context(tool_name, citation_lookup, args, kwargs)
+            start_ns = time.perf_counter_ns()
             logger.info("Tool call started", extra={"event": "tool_start"})
             try:
                 result = sync_func(*args, **kwargs)
-                elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
-                logger.info("Tool call completed", extra={"event": "tool_end", "elapsed_ms": elapsed_ms})
-                return result
             except Exception:
-                elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
+                elapsed_ms = round((time.perf_counter_ns() - start_ns) / 1_000_000, 2)
                 logger.exception(
                     "Tool call failed",
                     extra={"event": "tool_error", "elapsed_ms": elapsed_ms},
                 )
                 raise
-            finally:
-                request_metadata_ctx.reset(metadata_token)
-                correlation_id_ctx.reset(correlation_token)
+            elapsed_ms = round((time.perf_counter_ns() - start_ns) / 1_000_000, 2)
+            logger.info("Tool call completed", extra={"event": "tool_end", "elapsed_ms": elapsed_ms})
+            return result
+
+        @wraps(func)
+        def sync_wrapper(*args: P.args, **kwargs: P.kwargs) -> object:
+            return copy_context().run(run_sync, args, kwargs)
 
         return sync_wrapper
 
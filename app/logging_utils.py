@@ -4,8 +4,7 @@ from __future__ import annotations
 
 import logging
 import time
-from collections.abc import Iterator
-from contextlib import contextmanager
+from types import TracebackType
 from typing import Any, Mapping
 
 from app.logging_config import correlation_id_ctx, request_metadata_ctx
@@ -46,7 +45,35 @@ def log_event(
     logger.log(level, message, extra=context)
 
 
-@contextmanager
+class _LogOperation:
+    """Context manager that logs the start/end of an operation with elapsed time."""
+
+    __slots__ = ("logger", "event", "context", "_start_ns")
+
+    def __init__(self, logger: logging.Logger, event: str, context: dict[str, Any]) -> None:
+        self.logger = logger
+        self.event = event
+        self.context = context
+        self._start_ns = 0
+
+    def __enter__(self) -> None:
+        self.logger.info("Starting %s", self.event, extra=self.context)
+        self._start_ns = time.perf_counter_ns()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        elapsed_ms = (time.perf_counter_ns() - self._start_ns) / 1_000_000
+        context = {**self.context, "elapsed_ms": round(elapsed_ms, 2)}
+        if exc_type is None:
+            self.logger.info("Finished %s", self.event, extra=context)
+        elif issubclass(exc_type, Exception):
+            self.logger.error("%s failed", self.event, exc_info=exc, extra=context)
+
+
 def log_operation(
     logger: logging.Logger,
     *,
@@ -55,7 +82,7 @@ def log_operation(
     query_params: Mapping[str, Any] | None,
     event: str,
     extra_context: Mapping[str, Any] | None = None,
-) -> Iterator[None]:
+) -> _LogOperation:
     """Log the start/end of an operation with elapsed time."""
 
     correlation_id = correlation_id_ctx.get()
@@ -75,17 +102,4 @@ def log_operation(
     if extra_context:
         context.update(extra_context)
 
-    logger.info("Starting %s", event, extra=context)
-    start = time.perf_counter()
-
-    try:
-        yield
-    except Exception:
-        elapsed_ms = (time.perf_counter() - start) * 1000
-        failure_context = {**context, "elapsed_ms": round(elapsed_ms, 2)}
-        logger.exception("%s failed", event, extra=failure_context)
-        raise
-    else:
-        elapsed_ms = (time.perf_counter() - start) * 1000
-        success_context = {**context, "elapsed_ms": round(elapsed_ms, 2)}
-        logger.info("Finished %s", event, extra=success_context)
+    return _LogOperation(logger, event, context)
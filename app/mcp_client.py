@@ -8,7 +8,6 @@ API directly since MCP-to-MCP communication patterns are still evolving.
 import json
 import logging
 import time
-from datetime import UTC, datetime, timedelta
 from pathlib import Path
 from typing import Any, Iterable, cast
 
@@ -63,7 +62,8 @@ class CourtListenerClient:
         self.retry_attempts = max(1, self.settings.courtlistener_retry_attempts)
         self.backoff = self.settings.courtlistener_retry_backoff
         self.failure_count = 0
-        self.circuit_open_until: datetime | None = None
+        # time.monotonic() deadline until which requests are short-circuited; 0.0 when closed
+        self.circuit_open_until = 0.0
         self.cache_manager = get_cache_manager()
         self.cache_dir = self.settings.courtlistener_cache_dir
         self.cache_ttl = self.settings.courtlistener_ttl_search
@@ -96,16 +96,16 @@ class CourtListenerClient:
         return headers
 
     def _circuit_open(self) -> bool:
-        return self.circuit_open_until is not None and datetime.now(UTC) < self.circuit_open_until
+        return self.circuit_open_until > time.monotonic()
 
     def _record_failure(self) -> None:
         self.failure_count += 1
         if self.failure_count >= 5:
-            self.circuit_open_until = datetime.now(UTC) + timedelta(seconds=60)
+            self.circuit_open_until = time.monotonic() + 60
 
     def _record_success(self) -> None:
         self.failure_count = 0
-        self.circuit_open_until = None
+        self.circuit_open_until = 0.0
 
     async def _request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
         """Perform an HTTP request with retry, backoff, and circuit breaker."""
@@ -7,12 +7,12 @@ from fastmcp import FastMCP
 
 from ..analysis.citation_network import CitationNetworkBuilder
 from ..analysis.mermaid_generator import MermaidGenerator
-from ..analysis.treatment_classifier import TreatmentClassifier
 from ..logging_config import tool_logging
 from ..logging_utils import log_event, log_operation
 from ..mcp_client import get_client
 from ..mcp_types import ToolPayload
 from ..types import CitationNetworkResult, CourtListenerCase
+from .treatment import classifier
 
 logger = logging.getLogger(__name__)
 
@@ -112,8 +112,6 @@ async def build_citation_network_impl(
                 query_params=query_params,
                 citation_count=len(citing_cases),
             )
-            classifier = TreatmentClassifier()
-
             treatments = []
             for citing_case in citing_cases[:max_nodes]:
                 treatment = classifier.classify_treatment(citing_case, citation)
@@ -4,12 +4,18 @@ This module provides MCP tools for analyzing case treatment and validity,
 serving as a free alternative to Shepard's Citations and KeyCite.
 """
 
+import asyncio
 import logging
+from collections.abc import Iterator
 from typing import Any
 
 from fastmcp import FastMCP
 
-from app.analysis.treatment_classifier import TreatmentAnalysis, TreatmentClassifier
+from app.analysis.treatment_classifier import (
+    TreatmentAnalysis,
+    TreatmentClassifier,
+    TreatmentType,
+)
 from app.config import settings
 from app.logging_config import tool_logging
 from app.logging_utils import log_event, log_operation
@@ -19,9 +25,32 @@ from app.types import CourtListenerCase, TreatmentResult
 
 logger = logging.getLogger(__name__)
 
-# Initialize classifier
+# Initialize classifier; the network tools share it, and with it its analysis cache
 classifier = TreatmentClassifier()
 
+# Full opinion texts fetched at once during validity checks
+_FULL_TEXT_CONCURRENCY = 5
+
+# Treatment filters accepted by get_citing_cases; any other value disables filtering
+_TREATMENT_FILTERS = {
+    "positive": TreatmentType.POSITIVE,
+    "negative": TreatmentType.NEGATIVE,
+    "neutral": TreatmentType.NEUTRAL,
+}
+
+
+def _summarize_treatment(analysis: TreatmentAnalysis) -> dict[str, Any]:
+    """Serialize a treatment analysis for the get_citing_cases response."""
+    return {
+        "case_name": analysis.case_name,
+        "citation": analysis.citation,
+        "date_filed": analysis.date_filed,
+        "treatment": analysis.treatment_type.value,
+        "confidence": round(analysis.confidence, 2),
+        "signals": [s.signal for s in analysis.signals_found],
+        "excerpt": analysis.excerpt,
+    }
+
 
 # Implementation functions (can be called directly or via MCP tools)
 async def check_case_validity_impl(
@@ -87,11 +116,11 @@ async def check_case_validity_impl(
 
         # Step 4: Identify cases needing full text analysis
         strategy = settings.fetch_full_text_strategy
-        cases_for_full_text = []
-
-        for citing_case, initial_analysis in initial_treatments:
-            if classifier.should_fetch_full_text(initial_analysis, strategy):
-                cases_for_full_text.append((citing_case, initial_analysis))
+        cases_for_full_text = [
+            index
+            for index, (_, initial_analysis) in enumerate(initial_treatments)
+            if classifier.should_fetch_full_text(initial_analysis, strategy)
+        ]
 
         log_event(
             logger,
@@ -105,69 +134,90 @@ async def check_case_validity_impl(
             },
         )
 
-        # Step 5: Fetch full text and re-analyze (limited by max_full_text_fetches)
-        treatments: list[TreatmentAnalysis] = []
-        full_text_count = 0
-
-        for citing_case, initial_analysis in initial_treatments:
-            # Check if this case needs full text and we haven't hit the limit
-            needs_full_text = any(
-                c is citing_case for c, _ in cases_for_full_text
-            ) and full_text_count < settings.max_full_text_fetches
-
-            if needs_full_text:
+        # Step 5: Fetch full text and re-analyze until max_full_text_fetches
+        # analyses have been enhanced. Up to _FULL_TEXT_CONCURRENCY workers take
+        # candidates in case order; a failed or empty fetch lets the next
+        # candidate be tried, and no fetch starts while those in flight could
+        # already use up the budget.
+        async def analyze_with_full_text(
+            citing_case: CourtListenerCase,
+            opinion_id: int,
+        ) -> TreatmentAnalysis | None:
+            try:
+                full_text = await client.get_opinion_full_text(
+                    opinion_id, request_id=request_id
+                )
+
+                if not full_text:
+                    # No full text available, use initial analysis
+                    return None
+
+                # Re-analyze with full text
+                enhanced_analysis = classifier.classify_treatment(
+                    citing_case, citation, full_text=full_text
+                )
+                log_event(
+                    logger,
+                    "Enhanced analysis with full text",
+                    tool_name="check_case_validity",
+                    request_id=request_id,
+                    query_params={"citation": citation},
+                    event="full_text_analysis",
+                )
+                return enhanced_analysis
+
+            except Exception as e:
+                log_event(
+                    logger,
+                    f"Failed to fetch full text: {e}, using snippet analysis",
+                    level=logging.WARNING,
+                    tool_name="check_case_validity",
+                    request_id=request_id,
+                    query_params={"citation": citation},
+                    event="full_text_error",
+                )
+                return None
+
+        def full_text_candidates() -> Iterator[tuple[int, int]]:
+            for index in cases_for_full_text:
+                citing_case, _ = initial_treatments[index]
+                # Fetch full text for the first opinion; cases without opinion IDs
+                # keep their initial analysis
+                opinion_id = next(
+                    (op["id"] for op in citing_case.get("opinions", []) if op.get("id")),
+                    None,
+                )
+                if opinion_id:
+                    yield index, opinion_id
+
+        candidates = full_text_candidates()
+        enhanced: dict[int, TreatmentAnalysis] = {}
+        in_flight = 0
+
+        async def full_text_worker() -> None:
+            nonlocal in_flight
+            while len(enhanced) + in_flight < settings.max_full_text_fetches:
+                candidate = next(candidates, None)
+                if candidate is None:
+                    return
+                index, opinion_id = candidate
+                in_flight += 1
                 try:
-                    # Extract opinion IDs from the case
-                    opinion_ids = [
-                        op.get("id")
-                        for op in citing_case.get("opinions", [])
-                        if op.get("id")
-                    ]
-
-                    if opinion_ids:
-                        # Fetch full text for first opinion
-                        opinion_id = opinion_ids[0]
-
-                        full_text = await client.get_opinion_full_text(
-                            opinion_id, request_id=request_id
-                        )
-
-                        if full_text:
-                            # Re-analyze with full text
-                            enhanced_analysis = classifier.classify_treatment(
-                                citing_case, citation, full_text=full_text
-                            )
-                            treatments.append(enhanced_analysis)
-                            full_text_count += 1
-                            log_event(
-                                logger,
-                                "Enhanced analysis with full text",
-                                tool_name="check_case_validity",
-                                request_id=request_id,
-                                query_params={"citation": citation},
-                                event="full_text_analysis",
-                            )
-                        else:
-                            # No full text available, use initial analysis
-                            treatments.append(initial_analysis)
-                    else:
-                        # No opinion IDs, use initial analysis
-                        treatments.append(initial_analysis)
-
-                except Exception as e:
-                    log_event(
-                        logger,
-                        f"Failed to fetch full text: {e}, using snippet analysis",
-                        level=logging.WARNING,
-                        tool_name="check_case_validity",
-                        request_id=request_id,
-                        query_params={"citation": citation},
-                        event="full_text_error",
+                    analysis = await analyze_with_full_text(
+                        initial_treatments[index][0], opinion_id
                     )
-                    treatments.append(initial_analysis)
-            else:
-                # Use initial analysis
-                treatments.append(initial_analysis)
+                finally:
+                    in_flight -= 1
+                if analysis is not None:
+                    enhanced[index] = analysis
+
+        await asyncio.gather(*(full_text_worker() for _ in range(_FULL_TEXT_CONCURRENCY)))
+        full_text_count = len(enhanced)
+
+        treatments: list[TreatmentAnalysis] = [
+            enhanced.get(index, initial_analysis)
+            for index, (_, initial_analysis) in enumerate(initial_treatments)
+        ]
 
         log_event(
             logger,
@@ -274,32 +324,17 @@ async def get_citing_cases_impl(
         )
         citing_cases = citing_cases_result["results"]
 
-        # Analyze treatment
-        treatments = []
-        for citing_case in citing_cases:
-            analysis = classifier.classify_treatment(citing_case, citation)
-
-            # Apply filter if specified
-            if treatment_filter:
-                filter_lower = treatment_filter.lower()
-                if filter_lower == "positive" and analysis.treatment_type.value != "positive":
-                    continue
-                elif filter_lower == "negative" and analysis.treatment_type.value != "negative":
-                    continue
-                elif filter_lower == "neutral" and analysis.treatment_type.value != "neutral":
-                    continue
-
-            treatments.append(
-                {
-                    "case_name": analysis.case_name,
-                    "citation": analysis.citation,
-                    "date_filed": analysis.date_filed,
-                    "treatment": analysis.treatment_type.value,
-                    "confidence": round(analysis.confidence, 2),
-                    "signals": [s.signal for s in analysis.signals_found],
-                    "excerpt": analysis.excerpt,
-                }
-            )
+        # Classify, filter and serialize in one lazy pass over the citing cases;
+        # the filter is resolved to a treatment type once and skipped when unset
+        wanted_type = (
+            _TREATMENT_FILTERS.get(treatment_filter.lower()) if treatment_filter else None
+        )
+        analyses: Iterator[TreatmentAnalysis] = (
+            classifier.classify_treatment(citing_case, citation) for citing_case in citing_cases
+        )
+        if wanted_type is not None:
+            analyses = (a for a in analyses if a.treatment_type is wanted_type)
+        treatments = [_summarize_treatment(analysis) for analysis in analyses]
 
         log_event(
             logger,
@@ -0,0 +1,44 @@
+"""Shared fixtures for unit tests."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.config import Settings
+from app.mcp_client import CourtListenerClient
+
+
+@pytest.fixture(scope="session")
+def base_settings() -> Settings:
+    """Default settings with an API key, built once for the whole session.
+
+    ``model_construct`` fills in field defaults without reading ``.env`` or the
+    environment and without running validation; tests that exercise settings
+    parsing build ``Settings(...)`` directly.
+    """
+
+    return Settings.model_construct(courtlistener_api_key="token")
+
+
+@pytest.fixture
+def make_client(base_settings: Settings) -> Callable[..., CourtListenerClient]:
+    """Build a ``CourtListenerClient`` from the shared settings plus per-test overrides.
+
+    Overrides are applied with ``model_copy`` so the session settings are never
+    mutated and pydantic validation is not repeated for each test. The client's
+    ``httpx.AsyncClient`` is replaced by a stub exposing async ``request`` and
+    ``aclose`` mocks, so no transport, connection pool or TLS context is built;
+    tests configure ``client.client.request`` for the responses they need.
+    """
+
+    def _make_client(**overrides: Any) -> CourtListenerClient:
+        settings = base_settings.model_copy(update=overrides) if overrides else base_settings
+        http_stub = MagicMock(request=AsyncMock(), aclose=AsyncMock())
+        with patch("app.mcp_client.httpx.AsyncClient", return_value=http_stub):
+            return CourtListenerClient(settings)
+
+    return _make_client
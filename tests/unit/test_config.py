@@ -3,6 +3,7 @@
 import os
 import tempfile
 from pathlib import Path
+from types import MappingProxyType
 from unittest.mock import patch
 
 import pytest
@@ -10,6 +11,46 @@ import pytest
 from app.config import Settings, get_settings
 from app.settings_base import BaseSettings
 
+_EXPECTED_DEFAULTS = MappingProxyType(
+    {
+        # CourtListener MCP defaults
+        "courtlistener_mcp_url": "http://localhost:8000/mcp/",
+        "courtlistener_api_key": None,
+        "courtlistener_base_url": "https://www.courtlistener.com/api/rest/v4/",
+        # Timeout defaults
+        "courtlistener_timeout": 30.0,
+        "courtlistener_connect_timeout": 10.0,
+        "courtlistener_read_timeout": 60.0,
+        # Retry defaults
+        "courtlistener_retry_attempts": 3,
+        "courtlistener_retry_backoff": 1.0,
+        # Cache defaults
+        "cache_enabled": True,
+        "cache_dir": Path(".cache"),
+        "courtlistener_cache_dir": Path(".cache/courtlistener"),
+        # TTL defaults
+        "courtlistener_ttl_metadata": 86400,  # 24 hours
+        "courtlistener_ttl_text": 604800,  # 7 days
+        "courtlistener_ttl_search": 3600,  # 1 hour
+        "courtlistener_search_cache_enabled": True,
+        # Logging defaults
+        "log_level": "INFO",
+        "log_format": "json",
+        "log_date_format": "%Y-%m-%d %H:%M:%S",
+        "debug": False,
+        # Server defaults
+        "mcp_port": 8001,
+        # Treatment analysis defaults
+        "treatment_confidence_threshold": 0.7,
+        "max_citing_cases": 100,
+        "fetch_full_text_strategy": "smart",
+        "max_full_text_fetches": 10,
+        # Citation network defaults
+        "network_max_depth": 3,
+        "network_cache_dir": Path("./citation_networks"),
+    }
+)
+
 
 class TestDefaultSettings:
     """Test default configuration values."""
@@ -19,49 +60,8 @@ class TestDefaultSettings:
         with patch.dict(os.environ, {}, clear=True):
             settings = Settings()
 
-            # CourtListener MCP defaults
-            assert settings.courtlistener_mcp_url == "http://localhost:8000/mcp/"
-            assert settings.courtlistener_api_key is None
-            assert settings.courtlistener_base_url == "https://www.courtlistener.com/api/rest/v4/"
-
-            # Timeout defaults
-            assert settings.courtlistener_timeout == 30.0
-            assert settings.courtlistener_connect_timeout == 10.0
-            assert settings.courtlistener_read_timeout == 60.0
-
-            # Retry defaults
-            assert settings.courtlistener_retry_attempts == 3
-            assert settings.courtlistener_retry_backoff == 1.0
-
-            # Cache defaults
-            assert settings.cache_enabled is True
-            assert settings.cache_dir == Path(".cache")
-            assert settings.courtlistener_cache_dir == Path(".cache/courtlistener")
-
-            # TTL defaults
-            assert settings.courtlistener_ttl_metadata == 86400  # 24 hours
-            assert settings.courtlistener_ttl_text == 604800  # 7 days
-            assert settings.courtlistener_ttl_search == 3600  # 1 hour
-            assert settings.courtlistener_search_cache_enabled is True
-
-            # Logging defaults
-            assert settings.log_level == "INFO"
-            assert settings.log_format == "json"
-            assert settings.log_date_format == "%Y-%m-%d %H:%M:%S"
-            assert settings.debug is False
-
-            # Server defaults
-            assert settings.mcp_port == 8001
-
-            # Treatment analysis defaults
-            assert settings.treatment_confidence_threshold == 0.7
-            assert settings.max_citing_cases == 100
-            assert settings.fetch_full_text_strategy == "smart"
-            assert settings.max_full_text_fetches == 10
-
-            # Citation network defaults
-            assert settings.network_max_depth == 3
-            assert settings.network_cache_dir == Path("./citation_networks")
+        # A single model_dump batches field access instead of one getattr per field
+        assert settings.model_dump(include=set(_EXPECTED_DEFAULTS)) == _EXPECTED_DEFAULTS
 
     def test_get_settings_returns_global_instance(self):
         """Test that get_settings() returns a Settings instance."""
@@ -69,86 +69,108 @@ class TestDefaultSettings:
         assert isinstance(settings, Settings)
 
 
-class TestEnvVarOverride:
-    """Test environment variable override of default settings."""
-
-    def test_env_var_override_simple_string(self):
-        """Test that environment variables override string defaults."""
-        with patch.dict(os.environ, {
+ENV_OVERRIDES = (
+    # String defaults
+    (
+        {
             "COURTLISTENER_MCP_URL": "http://custom:9000/mcp/",
             "COURTLISTENER_BASE_URL": "https://custom.api/",
-        }, clear=True):
-            settings = Settings()
-            assert settings.courtlistener_mcp_url == "http://custom:9000/mcp/"
-            assert settings.courtlistener_base_url == "https://custom.api/"
-
-    def test_env_var_override_float(self):
-        """Test that environment variables override float settings."""
-        with patch.dict(os.environ, {
+        },
+        {
+            "courtlistener_mcp_url": "http://custom:9000/mcp/",
+            "courtlistener_base_url": "https://custom.api/",
+        },
+    ),
+    # Float settings
+    (
+        {
             "COURTLISTENER_TIMEOUT": "45.5",
             "COURTLISTENER_CONNECT_TIMEOUT": "15.0",
             "COURTLISTENER_READ_TIMEOUT": "90.0",
-        }, clear=True):
-            settings = Settings()
-            assert settings.courtlistener_timeout == 45.5
-            assert settings.courtlistener_connect_timeout == 15.0
-            assert settings.courtlistener_read_timeout == 90.0
-
-    def test_env_var_override_int(self):
-        """Test that environment variables override integer settings."""
-        with patch.dict(os.environ, {
+        },
+        {
+            "courtlistener_timeout": 45.5,
+            "courtlistener_connect_timeout": 15.0,
+            "courtlistener_read_timeout": 90.0,
+        },
+    ),
+    # Integer settings
+    (
+        {
             "COURTLISTENER_RETRY_ATTEMPTS": "5",
             "MCP_PORT": "9001",
             "MAX_CITING_CASES": "50",
-        }, clear=True):
-            settings = Settings()
-            assert settings.courtlistener_retry_attempts == 5
-            assert settings.mcp_port == 9001
-            assert settings.max_citing_cases == 50
-
-    def test_env_var_override_bool(self):
-        """Test that environment variables override boolean settings."""
-        with patch.dict(os.environ, {
+        },
+        {
+            "courtlistener_retry_attempts": 5,
+            "mcp_port": 9001,
+            "max_citing_cases": 50,
+        },
+    ),
+    # Boolean settings
+    (
+        {
             "CACHE_ENABLED": "false",
             "DEBUG": "true",
             "COURTLISTENER_SEARCH_CACHE_ENABLED": "false",
-        }, clear=True):
-            settings = Settings()
-            assert settings.cache_enabled is False
-            assert settings.debug is True
-            assert settings.courtlistener_search_cache_enabled is False
-
-    def test_env_var_override_path(self):
-        """Test that environment variables override Path settings."""
-        with patch.dict(os.environ, {
+        },
+        {
+            "cache_enabled": False,
+            "debug": True,
+            "courtlistener_search_cache_enabled": False,
+        },
+    ),
+    # Path settings
+    (
+        {
             "CACHE_DIR": "/tmp/custom_cache",
             "COURTLISTENER_CACHE_DIR": "/tmp/cl_cache",
             "NETWORK_CACHE_DIR": "/tmp/networks",
-        }, clear=True):
-            settings = Settings()
-            assert settings.cache_dir == Path("/tmp/custom_cache")
-            assert settings.courtlistener_cache_dir == Path("/tmp/cl_cache")
-            assert settings.network_cache_dir == Path("/tmp/networks")
-
-    def test_env_var_override_log_level(self):
-        """Test environment variable override for log level."""
-        with patch.dict(os.environ, {
+        },
+        {
+            "cache_dir": Path("/tmp/custom_cache"),
+            "courtlistener_cache_dir": Path("/tmp/cl_cache"),
+            "network_cache_dir": Path("/tmp/networks"),
+        },
+    ),
+    # Log level and format
+    (
+        {
             "LOG_LEVEL": "DEBUG",
             "LOG_FORMAT": "text",
-        }, clear=True):
-            settings = Settings()
-            assert settings.log_level == "DEBUG"
-            assert settings.log_format == "text"
-
-    def test_env_var_case_insensitive(self):
-        """Test that environment variables are case-insensitive."""
-        with patch.dict(os.environ, {
+        },
+        {
+            "log_level": "DEBUG",
+            "log_format": "text",
+        },
+    ),
+    # Environment variable names are case-insensitive
+    (
+        {
             "courtlistener_timeout": "25.0",  # lowercase
             "COURTLISTENER_RETRY_ATTEMPTS": "4",  # uppercase
-        }, clear=True):
+        },
+        {
+            "courtlistener_timeout": 25.0,
+            "courtlistener_retry_attempts": 4,
+        },
+    ),
+)
+
+# Explicit ids keep pytest from repr()-ing every env dict at collection time
+ENV_OVERRIDE_IDS = ("string", "float", "int", "bool", "path", "log_level", "case_insensitive")
+
+
+class TestEnvVarOverride:
+    """Test environment variable override of default settings."""
+
+    @pytest.mark.parametrize(("env", "expected"), ENV_OVERRIDES, ids=ENV_OVERRIDE_IDS)
+    def test_env_var_override(self, env, expected):
+        """Test that environment variables override the matching defaults."""
+        with patch.dict(os.environ, env, clear=True):
             settings = Settings()
-            assert settings.courtlistener_timeout == 25.0
-            assert settings.courtlistener_retry_attempts == 4
+
+        assert settings.model_dump(include=set(expected)) == expected
 
 
 class TestAliasChoicesForApiKey:
@@ -1,16 +1,18 @@
 """Tests for logging infrastructure including formatters, context managers, and decorators."""
 
 import asyncio
+import copy
 import json
 import logging
+import sys
 import time
-from io import StringIO
-from unittest.mock import MagicMock, patch
+from io import BytesIO, StringIO, TextIOWrapper
 from unittest.mock import patch
 
 import pytest
 
 from app.logging_config import (
+    BufferedStreamHandler,
     JsonFormatter,
     configure_logging,
     correlation_id_ctx,
@@ -19,24 +21,31 @@ from app.logging_config import (
 )
 from app.logging_utils import log_event, log_operation
 
+_FORMATTER = JsonFormatter()
+_BLANK_RECORD = logging.LogRecord(
+    name="test.logger",
+    level=logging.INFO,
+    pathname="test.py",
+    lineno=10,
+    msg="Test message",
+    args=(),
+    exc_info=None,
+)
+
+
+def _make_record(**overrides):
+    """Return a shallow copy of the blank test record with the given attributes replaced."""
+    record = copy.copy(_BLANK_RECORD)
+    record.__dict__.update(overrides)
+    return record
+
 
 class TestJsonFormatter:
     """Tests for the JsonFormatter class."""
 
     def test_format_basic_log_record(self):
         """Test formatting a basic log record with minimal fields."""
-        formatter = JsonFormatter()
-        record = logging.LogRecord(
-            name="test.logger",
-            level=logging.INFO,
-            pathname="test.py",
-            lineno=10,
-            msg="Test message",
-            args=(),
-            exc_info=None,
-        )
-
-        result = formatter.format(record)
+        result = _FORMATTER.format(_make_record())
         data = json.loads(result)
 
         assert data["level"] == "INFO"
@@ -44,23 +53,22 @@ class TestJsonFormatter:
         assert data["message"] == "Test message"
         assert "timestamp" in data
 
+    def test_format_timestamp_uses_record_creation_time(self):
+        """Test that timestamps follow the record's creation time across seconds."""
+        first = json.loads(_FORMATTER.format(_make_record(created=1700000000.25)))
+        same_second = json.loads(_FORMATTER.format(_make_record(created=1700000000.5)))
+        next_second = json.loads(_FORMATTER.format(_make_record(created=1700000001.75)))
+
+        assert first["timestamp"] == "2023-11-14T22:13:20.250000+00:00"
+        assert same_second["timestamp"] == "2023-11-14T22:13:20.500000+00:00"
+        assert next_second["timestamp"] == "2023-11-14T22:13:21.750000+00:00"
+
     def test_format_includes_correlation_id(self):
         """Test that correlation ID is included when set in context."""
-        formatter = JsonFormatter()
         correlation_token = correlation_id_ctx.set("test-correlation-123")
 
         try:
-            record = logging.LogRecord(
-                name="test.logger",
-                level=logging.INFO,
-                pathname="test.py",
-                lineno=10,
-                msg="Test message",
-                args=(),
-                exc_info=None,
-            )
-
-            result = formatter.format(record)
+            result = _FORMATTER.format(_make_record())
             data = json.loads(result)
 
             assert data["correlation_id"] == "test-correlation-123"
@@ -69,21 +77,10 @@ class TestJsonFormatter:
 
     def test_format_includes_tool_name_from_metadata(self):
         """Test that tool_name is included from request metadata."""
-        formatter = JsonFormatter()
         metadata_token = request_metadata_ctx.set({"tool_name": "test_tool"})
 
         try:
-            record = logging.LogRecord(
-                name="test.logger",
-                level=logging.INFO,
-                pathname="test.py",
-                lineno=10,
-                msg="Test message",
-                args=(),
-                exc_info=None,
-            )
-
-            result = formatter.format(record)
+            result = _FORMATTER.format(_make_record())
             data = json.loads(result)
 
             assert data["tool_name"] == "test_tool"
@@ -92,23 +89,12 @@ class TestJsonFormatter:
 
     def test_format_includes_citation_from_metadata(self):
         """Test that citation is included from request metadata."""
-        formatter = JsonFormatter()
         metadata_token = request_metadata_ctx.set(
             {"tool_name": "test_tool", "citation": "410 U.S. 113"}
         )
 
         try:
-            record = logging.LogRecord(
-                name="test.logger",
-                level=logging.INFO,
-                pathname="test.py",
-                lineno=10,
-                msg="Test message",
-                args=(),
-                exc_info=None,
-            )
-
-            result = formatter.format(record)
+            result = _FORMATTER.format(_make_record())
             data = json.loads(result)
 
             assert data["citation"] == "410 U.S. 113"
@@ -117,22 +103,14 @@ class TestJsonFormatter:
 
     def test_format_includes_extra_fields(self):
         """Test that extra fields (elapsed_ms, event, etc.) are included."""
-        formatter = JsonFormatter()
-        record = logging.LogRecord(
-            name="test.logger",
-            level=logging.INFO,
-            pathname="test.py",
-            lineno=10,
-            msg="Test message",
-            args=(),
-            exc_info=None,
+        record = _make_record(
+            elapsed_ms=123.45,
+            event="tool_start",
+            query_params={"q": "test"},
+            citation_count=5,
         )
-        record.elapsed_ms = 123.45
-        record.event = "tool_start"
-        record.query_params = {"q": "test"}
-        record.citation_count = 5
 
-        result = formatter.format(record)
+        result = _FORMATTER.format(record)
         data = json.loads(result)
 
         assert data["elapsed_ms"] == 123.45
@@ -140,25 +118,30 @@ class TestJsonFormatter:
         assert data["query_params"] == {"q": "test"}
         assert data["citation_count"] == 5
 
+    def test_format_includes_arbitrary_extra_fields(self):
+        """Test that any non-standard record attribute is included, but LogRecord internals are not."""
+        record = _make_record(request_id="req-123", custom_field="custom_value")
+
+        result = _FORMATTER.format(record)
+        data = json.loads(result)
+
+        assert data["request_id"] == "req-123"
+        assert data["custom_field"] == "custom_value"
+        assert "pathname" not in data
+        assert "lineno" not in data
+
     def test_format_includes_exception_info(self):
         """Test that exception information is included when present."""
-        formatter = JsonFormatter()
-        import sys
-
         try:
             raise ValueError("Test error")
         except ValueError:
-            exc_info = sys.exc_info()
-            record = logging.LogRecord(
-                name="test.logger",
-                level=logging.ERROR,
-                pathname="test.py",
-                lineno=10,
+            record = _make_record(
+                levelname="ERROR",
+                levelno=logging.ERROR,
                 msg="Error occurred",
-                args=(),
-                exc_info=exc_info,
+                exc_info=sys.exc_info(),
             )
-            result = formatter.format(record)
+            result = _FORMATTER.format(record)
             data = json.loads(result)
 
             assert "exception" in data
@@ -166,20 +149,9 @@ class TestJsonFormatter:
 
     def test_format_skips_none_extra_fields(self):
         """Test that extra fields with None values are not included."""
-        formatter = JsonFormatter()
-        record = logging.LogRecord(
-            name="test.logger",
-            level=logging.INFO,
-            pathname="test.py",
-            lineno=10,
-            msg="Test message",
-            args=(),
-            exc_info=None,
-        )
-        record.elapsed_ms = None
-        record.event = None
+        record = _make_record(elapsed_ms=None, event=None)
 
-        result = formatter.format(record)
+        result = _FORMATTER.format(record)
         data = json.loads(result)
 
         assert "elapsed_ms" not in data
@@ -187,23 +159,30 @@ class TestJsonFormatter:
 
     def test_format_output_is_valid_json(self):
         """Test that formatted output is always valid JSON."""
-        formatter = JsonFormatter()
-        record = logging.LogRecord(
-            name="test.logger",
-            level=logging.WARNING,
-            pathname="test.py",
+        record = _make_record(
+            levelname="WARNING",
+            levelno=logging.WARNING,
             lineno=42,
             msg="Warning with unicode: こんにちは",
-            args=(),
-            exc_info=None,
         )
 
-        result = formatter.format(record)
+        result = _FORMATTER.format(record)
         data = json.loads(result)
 
         assert data["level"] == "WARNING"
         assert "こんにちは" in data["message"]
 
+    def test_format_bytes_matches_format(self):
+        """Test that format_bytes yields the same JSON as format, as a UTF-8 line."""
+        record = _make_record(msg="unicode: こんにちは", event="tool_start")
+
+        line = _FORMATTER.format_bytes(record)
+
+        assert line.endswith(b"\n")
+        data = json.loads(line)
+        assert data["message"] == "unicode: こんにちは"
+        assert data["event"] == "tool_start"
+
 
 class TestConfigureLogging:
     """Tests for the configure_logging function."""
@@ -230,6 +209,7 @@ class TestConfigureLogging:
         try:
             configure_logging("INFO", "json")
             handler = root_logger.handlers[0]
+            assert isinstance(handler, BufferedStreamHandler)
             assert isinstance(handler.formatter, JsonFormatter)
         finally:
             root_logger.handlers = original_handlers
@@ -275,47 +255,188 @@ class TestConfigureLogging:
         finally:
             root_logger.handlers = original_handlers
 
+    def test_configure_logging_closes_replaced_handlers(self, tmp_path):
+        """Test that replaced handlers are closed so their files are released."""
+        root_logger = logging.getLogger()
+        original_handlers = root_logger.handlers[:]
 
-class TestToolLoggingDecorator:
-    """Tests for the tool_logging decorator."""
+        file_handler = logging.FileHandler(tmp_path / "app.log")
+        root_logger.addHandler(file_handler)
 
-    def test_tool_logging_sync_function_success(self):
-        """Test tool_logging decorator on synchronous function with successful execution."""
-        logger = logging.getLogger("test")
-        logger.setLevel(logging.INFO)
+        try:
+            configure_logging("INFO", "json")
+            assert file_handler.stream is None
+        finally:
+            root_logger.handlers = original_handlers
+
+    def test_configure_logging_keeps_records_buffered_before_reconfiguring(self):
+        """Test that records still buffered by a replaced handler are written out."""
+        root_logger = logging.getLogger()
+        original_handlers = root_logger.handlers[:]
+        original_level = root_logger.level
+        stream = StringIO()
+
+        try:
+            with patch("sys.stderr", stream):
+                configure_logging("INFO", "%(message)s")
+                root_logger.info("first record")
+                assert stream.getvalue() == ""
 
-        log_records = []
+                configure_logging("INFO", "%(message)s")
+                root_logger.info("second record")
+                root_logger.handlers[0].flush()
+
+            assert stream.getvalue() == "first record\nsecond record\n"
+        finally:
+            root_logger.handlers = original_handlers
+            root_logger.setLevel(original_level)
 
-        class TestHandler(logging.Handler):
-            def emit(self, record):
-                log_records.append(record)
 
-        handler = TestHandler()
-        logger.addHandler(handler)
+class TestBufferedStreamHandler:
+    """Tests for the BufferedStreamHandler installed by configure_logging."""
 
+    def _make_logger(self, handler: logging.Handler) -> logging.Logger:
+        logger = logging.getLogger("test.buffered")
+        logger.setLevel(logging.DEBUG)
+        logger.propagate = False
+        logger.handlers = [handler]
+        return logger
+
+    def test_close_writes_pending_records(self):
+        """Test that closing the handler does not drop buffered records."""
+        stream = StringIO()
+        handler = BufferedStreamHandler(stream, capacity=10)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger = self._make_logger(handler)
+
+        logger.info("pending")
+        handler.close()
+
+        assert stream.getvalue() == "pending\n"
+
+    def test_holds_records_until_capacity(self):
+        """Test that records below the flush level are written once capacity is reached."""
+        stream = StringIO()
+        handler = BufferedStreamHandler(stream, capacity=3)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger = self._make_logger(handler)
+
+        logger.info("one")
+        logger.info("two")
+        assert stream.getvalue() == ""
+
+        logger.info("three")
+        assert stream.getvalue() == "one\ntwo\nthree\n"
+
+    def test_flushes_immediately_at_flush_level(self):
+        """Test that an ERROR record flushes everything pending."""
+        stream = StringIO()
+        handler = BufferedStreamHandler(stream, capacity=100)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger = self._make_logger(handler)
+
+        logger.info("pending")
+        logger.error("boom")
+
+        assert stream.getvalue() == "pending\nboom\n"
+
+    def test_flushes_warnings_immediately(self):
+        """Test that WARNING records are not held back by default."""
+        stream = StringIO()
+        handler = BufferedStreamHandler(stream, capacity=100)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger = self._make_logger(handler)
+
+        logger.info("pending")
+        logger.warning("careful")
+
+        assert stream.getvalue() == "pending\ncareful\n"
+
+    def test_flushes_when_oldest_pending_record_is_stale(self):
+        """Test that a record arriving after max_delay writes out the waiting lines."""
+        stream = StringIO()
+        handler = BufferedStreamHandler(stream, capacity=100, max_delay=1.0)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger = self._make_logger(handler)
+
+        with patch("app.logging_config.time.monotonic", side_effect=[100.0, 100.5, 101.2]):
+            logger.info("one")
+            logger.info("two")
+            assert stream.getvalue() == ""
+
+            logger.info("three")
+
+        assert stream.getvalue() == "one\ntwo\nthree\n"
+
+    def test_writes_each_record_to_a_tty(self):
+        """Test that interactive streams are not buffered."""
+        stream = StringIO()
+        stream.isatty = lambda: True
+        handler = BufferedStreamHandler(stream, capacity=100)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger = self._make_logger(handler)
+
+        logger.info("shown")
+
+        assert stream.getvalue() == "shown\n"
+
+    def test_formats_with_context_at_emit_time(self):
+        """Test that context variables are captured when the record is emitted, not flushed."""
+        stream = StringIO()
+        handler = BufferedStreamHandler(stream, capacity=100)
+        handler.setFormatter(JsonFormatter())
+        logger = self._make_logger(handler)
+
+        token = correlation_id_ctx.set("emit-time-id")
         try:
+            logger.info("inside")
+        finally:
+            correlation_id_ctx.reset(token)
+        handler.flush()
+
+        data = json.loads(stream.getvalue())
+        assert data["correlation_id"] == "emit-time-id"
+
+    def test_writes_bytes_to_binary_backed_stream(self):
+        """Test that lines go straight to the underlying buffer of a text stream."""
+        raw = BytesIO()
+        stream = TextIOWrapper(raw, encoding="utf-8")
+        handler = BufferedStreamHandler(stream, capacity=100)
+        handler.setFormatter(JsonFormatter())
+        logger = self._make_logger(handler)
+
+        stream.write("text first\n")
+        logger.info("こんにちは")
+        logger.info("second")
+        handler.flush()
+
+        lines = raw.getvalue().decode("utf-8").splitlines()
+        assert lines[0] == "text first"
+        assert json.loads(lines[1])["message"] == "こんにちは"
+        assert json.loads(lines[2])["message"] == "second"
+
+
+class TestToolLoggingDecorator:
+    """Tests for the tool_logging decorator."""
+
+    def test_tool_logging_sync_function_success(self, caplog):
+        """Test tool_logging decorator on synchronous function with successful execution."""
+        caplog.set_level(logging.DEBUG, logger="test")
+        logger = logging.getLogger("test")
+
+        with patch("app.logging_config.logging.getLogger", return_value=logger):
             @tool_logging("test_tool")
             def test_func(arg1: str, arg2: int = 10):
                 return f"{arg1}-{arg2}"
 
             # Call the decorated function
-            with patch("app.logging_config.logging.getLogger", return_value=logger):
-            with patch("app.logging_config.logging.getLogger", return_value=logger):
-                @tool_logging("test_tool")
-                def test_func(arg1: str, arg2: int = 10):
-                    return f"{arg1}-{arg2}"
-
-                # Call the decorated function
-                result = test_func("hello", arg2=20)
-
-            assert result == "hello-20"
-            # We should have start and end events
-            events = [r.getMessage() for r in log_records if hasattr(r, "event")]
-            messages = [record.getMessage() for record in log_records]
-            assert "Tool call started" in messages
-            assert "Tool call completed" in messages
-        finally:
-            logger.removeHandler(handler)
+            result = test_func("hello", arg2=20)
+
+        assert result == "hello-20"
+        # We should have start and end events
+        messages = [record.getMessage() for record in caplog.records]
+        assert "Tool call started" in messages
+        assert "Tool call completed" in messages
 
     def test_tool_logging_sync_function_exception(self):
         """Test tool_logging decorator on synchronous function with exception."""
@@ -331,32 +452,23 @@ class TestToolLoggingDecorator:
         # Verify correlation ID was cleaned up
         assert correlation_id_ctx.get() is None
 
-    def test_tool_logging_async_function_success(self):
+    def test_tool_logging_async_function_success(self, caplog):
         """Test tool_logging decorator on asynchronous function with successful execution."""
+        caplog.set_level(logging.DEBUG, logger="test")
         logger = logging.getLogger("test")
-        logger.setLevel(logging.INFO)
-
-        log_records = []
 
-        class TestHandler(logging.Handler):
-            def emit(self, record):
-                log_records.append(record)
-
-        handler = TestHandler()
-        logger.addHandler(handler)
-
-        try:
+        with patch("app.logging_config.logging.getLogger", return_value=logger):
             @tool_logging("test_tool")
             async def test_func(arg1: str) -> str:
                 await asyncio.sleep(0.01)
                 return f"result-{arg1}"
 
-            with patch("app.logging_config.logging.getLogger", return_value=logger):
-                result = asyncio.run(test_func("hello"))
+            result = asyncio.run(test_func("hello"))
 
-            assert result == "result-hello"
-        finally:
-            logger.removeHandler(handler)
+        assert result == "result-hello"
+        messages = [record.getMessage() for record in caplog.records]
+        assert "Tool call started" in messages
+        assert "Tool call completed" in messages
 
     def test_tool_logging_async_function_exception(self):
         """Test tool_logging decorator on asynchronous function with exception."""
@@ -375,7 +487,6 @@ class TestToolLoggingDecorator:
 
     def test_tool_logging_sets_correlation_id(self):
         """Test that tool_logging decorator sets a correlation ID."""
-        logger = logging.getLogger("test")
 
         @tool_logging("test_tool")
         def test_func():
@@ -386,9 +497,18 @@ class TestToolLoggingDecorator:
         assert correlation_id is not None
         assert len(correlation_id) > 0
 
+    def test_tool_logging_correlation_ids_are_unique(self):
+        """Test that each tool call gets a distinct correlation ID."""
+
+        @tool_logging("test_tool")
+        def test_func():
+            return correlation_id_ctx.get()
+
+        correlation_ids = {test_func() for _ in range(100)}
+        assert len(correlation_ids) == 100
+
     def test_tool_logging_sets_metadata(self):
         """Test that tool_logging decorator sets request metadata."""
-        logger = logging.getLogger("test")
 
         @tool_logging("test_tool")
         def test_func():
@@ -411,7 +531,6 @@ class TestToolLoggingDecorator:
 
     def test_tool_logging_with_citation_argument(self):
         """Test that tool_logging extracts citation from function arguments."""
-        logger = logging.getLogger("test")
 
         @tool_logging("test_tool")
         def test_func(citation: str):
@@ -422,7 +541,6 @@ class TestToolLoggingDecorator:
 
     def test_tool_logging_with_citation_id_argument(self):
         """Test that tool_logging extracts citation_id from function arguments."""
-        logger = logging.getLogger("test")
 
         @tool_logging("test_tool")
         def test_func(citation_id: str):
@@ -433,7 +551,6 @@ class TestToolLoggingDecorator:
 
     def test_tool_logging_with_citation_text_argument(self):
         """Test that tool_logging extracts citation_text from function arguments."""
-        logger = logging.getLogger("test")
 
         @tool_logging("test_tool")
         def test_func(citation_text: str):
@@ -442,46 +559,52 @@ class TestToolLoggingDecorator:
         metadata = test_func("505 U.S. 833")
         assert metadata.get("citation") == "505 U.S. 833"
 
-    def test_tool_logging_measures_elapsed_time(self):
-        """Test that tool_logging decorator measures and logs elapsed time."""
+    def test_tool_logging_citation_from_keyword_and_default(self):
+        """Test that citation lookup handles keyword arguments, defaults and priority."""
 
         @tool_logging("test_tool")
-        def test_func():
-            time.sleep(0.02)  # Sleep for 20ms to ensure measurable elapsed time
-            return "result"
+        def test_func(query: str, citation_text: str = "347 U.S. 483", *, citation: str | None = None):
+            return request_metadata_ctx.get()
 
-        # Capture logs
-        logger = logging.getLogger()
-        logger.setLevel(logging.DEBUG)
+        assert test_func("q").get("citation") == "347 U.S. 483"
+        assert test_func("q", citation_text="505 U.S. 833").get("citation") == "505 U.S. 833"
+        assert test_func("q", "505 U.S. 833", citation="410 U.S. 113").get("citation") == "410 U.S. 113"
 
-        log_records = []
+    def test_tool_logging_without_citation_argument(self):
+        """Test that no citation is recorded for tools without citation parameters."""
 
-        class TestHandler(logging.Handler):
-            def emit(self, record):
-                log_records.append(record)
+        @tool_logging("test_tool")
+        def test_func(query: str):
+            return request_metadata_ctx.get()
 
-        handler = TestHandler()
-        logger.addHandler(handler)
+        assert "citation" not in test_func("roe")
 
-        try:
-            result = test_func()
+    def test_tool_logging_measures_elapsed_time(self, caplog):
+        """Test that tool_logging decorator measures and logs elapsed time."""
+        caplog.set_level(logging.DEBUG, logger="test")
+        logger = logging.getLogger("test")
+
+        with patch("app.logging_config.logging.getLogger", return_value=logger):
+            @tool_logging("test_tool")
+            def test_func():
+                time.sleep(0.02)  # Sleep for 20ms to ensure measurable elapsed time
+                return "result"
 
-            assert result == "result"
+        result = test_func()
 
-            # Find records with elapsed_ms - it gets added as an extra field
-            elapsed_records = [
-                r for r in log_records if hasattr(r, "elapsed_ms") and r.elapsed_ms is not None
-            ]
-            # At least one record should have elapsed time
-            assert len(elapsed_records) >= 1, f"Expected elapsed_ms field in log records, got {[(r.getMessage(), getattr(r, 'elapsed_ms', None)) for r in log_records]}"
-            # The elapsed time should be at least 20ms
-            assert any(r.elapsed_ms >= 20 for r in elapsed_records), f"Expected elapsed_ms >= 20, got {[r.elapsed_ms for r in elapsed_records]}"
-        finally:
-            logger.removeHandler(handler)
+        assert result == "result"
+
+        # Find records with elapsed_ms - it gets added as an extra field
+        elapsed_records = [
+            r for r in caplog.records if hasattr(r, "elapsed_ms") and r.elapsed_ms is not None
+        ]
+        # At least one record should have elapsed time
+        assert len(elapsed_records) >= 1, f"Expected elapsed_ms field in log records, got {[(r.getMessage(), getattr(r, 'elapsed_ms', None)) for r in caplog.records]}"
+        # The elapsed time should be at least 20ms
+        assert any(r.elapsed_ms >= 20 for r in elapsed_records), f"Expected elapsed_ms >= 20, got {[r.elapsed_ms for r in elapsed_records]}"
 
     def test_tool_logging_cleans_up_context(self):
         """Test that tool_logging decorator cleans up context after execution."""
-        logger = logging.getLogger("test")
 
         @tool_logging("test_tool")
         def test_func():
@@ -500,340 +623,175 @@ class TestToolLoggingDecorator:
 class TestLogEvent:
     """Tests for the log_event function."""
 
-    def test_log_event_basic(self):
+    def test_log_event_basic(self, caplog):
         """Test basic log_event functionality."""
+        caplog.set_level(logging.DEBUG, logger="test")
         logger = logging.getLogger("test")
-        logger.setLevel(logging.INFO)
-
-        log_records = []
 
-        class TestHandler(logging.Handler):
-            def emit(self, record):
-                log_records.append(record)
+        log_event(logger, "Test event")
+        assert len(caplog.records) == 1
+        assert caplog.records[0].getMessage() == "Test event"
 
-        handler = TestHandler()
-        logger.addHandler(handler)
-
-        try:
-            log_event(logger, "Test event")
-            assert len(log_records) == 1
-            assert log_records[0].getMessage() == "Test event"
-        finally:
-            logger.removeHandler(handler)
-
-    def test_log_event_with_level(self):
+    def test_log_event_with_level(self, caplog):
         """Test log_event with custom log level."""
+        caplog.set_level(logging.DEBUG, logger="test")
         logger = logging.getLogger("test")
-        logger.setLevel(logging.DEBUG)
-
-        log_records = []
 
-        class TestHandler(logging.Handler):
-            def emit(self, record):
-                log_records.append(record)
-
-        handler = TestHandler()
-        logger.addHandler(handler)
-
-        try:
-            log_event(logger, "Debug event", level=logging.DEBUG)
-            assert log_records[0].levelno == logging.DEBUG
+        log_event(logger, "Debug event", level=logging.DEBUG)
+        assert caplog.records[0].levelno == logging.DEBUG
 
-            log_event(logger, "Warning event", level=logging.WARNING)
-            assert log_records[1].levelno == logging.WARNING
-        finally:
-            logger.removeHandler(handler)
+        log_event(logger, "Warning event", level=logging.WARNING)
+        assert caplog.records[1].levelno == logging.WARNING
 
-    def test_log_event_with_tool_name(self):
+    def test_log_event_with_tool_name(self, caplog):
         """Test log_event includes tool_name in extra context."""
+        caplog.set_level(logging.DEBUG, logger="test")
         logger = logging.getLogger("test")
-        logger.setLevel(logging.INFO)
-
-        log_records = []
-
-        class TestHandler(logging.Handler):
-            def emit(self, record):
-                log_records.append(record)
 
-        handler = TestHandler()
-        logger.addHandler(handler)
-
-        try:
-            log_event(logger, "Test", tool_name="my_tool")
-            assert log_records[0].tool_name == "my_tool"
-        finally:
-            logger.removeHandler(handler)
+        log_event(logger, "Test", tool_name="my_tool")
+        assert caplog.records[0].tool_name == "my_tool"
 
-    def test_log_event_with_query_params(self):
+    def test_log_event_with_query_params(self, caplog):
         """Test log_event includes query_params."""
+        caplog.set_level(logging.DEBUG, logger="test")
         logger = logging.getLogger("test")
-        logger.setLevel(logging.INFO)
 
-        log_records = []
+        log_event(logger, "Test", query_params={"q": "roe", "limit": 10})
+        assert caplog.records[0].query_params == {"q": "roe", "limit": 10}
 
-        class TestHandler(logging.Handler):
-            def emit(self, record):
-                log_records.append(record)
-
-        handler = TestHandler()
-        logger.addHandler(handler)
-
-        try:
-            log_event(logger, "Test", query_params={"q": "roe", "limit": 10})
-            assert log_records[0].query_params == {"q": "roe", "limit": 10}
-        finally:
-            logger.removeHandler(handler)
-
-    def test_log_event_with_citation_count(self):
+    def test_log_event_with_citation_count(self, caplog):
         """Test log_event includes citation_count."""
+        caplog.set_level(logging.DEBUG, logger="test")
         logger = logging.getLogger("test")
-        logger.setLevel(logging.INFO)
-
-        log_records = []
 
-        class TestHandler(logging.Handler):
-            def emit(self, record):
-                log_records.append(record)
+        log_event(logger, "Test", citation_count=42)
+        assert caplog.records[0].citation_count == 42
 
-        handler = TestHandler()
-        logger.addHandler(handler)
-
-        try:
-            log_event(logger, "Test", citation_count=42)
-            assert log_records[0].citation_count == 42
-        finally:
-            logger.removeHandler(handler)
-
-    def test_log_event_with_event_tag(self):
+    def test_log_event_with_event_tag(self, caplog):
         """Test log_event includes event tag."""
+        caplog.set_level(logging.DEBUG, logger="test")
         logger = logging.getLogger("test")
-        logger.setLevel(logging.INFO)
-
-        log_records = []
-
-        class TestHandler(logging.Handler):
-            def emit(self, record):
-                log_records.append(record)
 
-        handler = TestHandler()
-        logger.addHandler(handler)
+        log_event(logger, "Test", event="custom_event")
+        assert caplog.records[0].event == "custom_event"
 
-        try:
-            log_event(logger, "Test", event="custom_event")
-            assert log_records[0].event == "custom_event"
-        finally:
-            logger.removeHandler(handler)
-
-    def test_log_event_with_correlation_id(self):
+    def test_log_event_with_correlation_id(self, caplog):
         """Test log_event includes correlation ID from context."""
+        caplog.set_level(logging.DEBUG, logger="test")
         logger = logging.getLogger("test")
-        logger.setLevel(logging.INFO)
-
-        log_records = []
-
-        class TestHandler(logging.Handler):
-            def emit(self, record):
-                log_records.append(record)
-
-        handler = TestHandler()
-        logger.addHandler(handler)
-
         correlation_token = correlation_id_ctx.set("test-correlation-456")
 
         try:
             log_event(logger, "Test")
-            assert log_records[0].correlation_id == "test-correlation-456"
+            assert caplog.records[0].correlation_id == "test-correlation-456"
         finally:
             correlation_id_ctx.reset(correlation_token)
-            logger.removeHandler(handler)
 
-    def test_log_event_with_extra_context(self):
+    def test_log_event_with_extra_context(self, caplog):
         """Test log_event includes extra context."""
+        caplog.set_level(logging.DEBUG, logger="test")
         logger = logging.getLogger("test")
-        logger.setLevel(logging.INFO)
-
-        log_records = []
-
-        class TestHandler(logging.Handler):
-            def emit(self, record):
-                log_records.append(record)
 
-        handler = TestHandler()
-        logger.addHandler(handler)
-
-        try:
-            log_event(
-                logger,
-                "Test",
-                extra_context={"custom_field": "custom_value", "request_id": "req-123"},
-            )
-            assert log_records[0].custom_field == "custom_value"
-            assert log_records[0].request_id == "req-123"
-        finally:
-            logger.removeHandler(handler)
+        log_event(
+            logger,
+            "Test",
+            extra_context={"custom_field": "custom_value", "request_id": "req-123"},
+        )
+        assert caplog.records[0].custom_field == "custom_value"
+        assert caplog.records[0].request_id == "req-123"
 
 
 class TestLogOperationContextManager:
     """Tests for the log_operation context manager."""
 
-    def test_log_operation_success(self):
+    def test_log_operation_success(self, caplog):
         """Test log_operation logs start and finish on success."""
+        caplog.set_level(logging.DEBUG, logger="test")
         logger = logging.getLogger("test")
-        logger.setLevel(logging.INFO)
 
-        log_records = []
+        with log_operation(
+            logger, tool_name="test_tool", request_id="req-1", query_params=None, event="test_event"
+        ):
+            pass
 
-        class TestHandler(logging.Handler):
-            def emit(self, record):
-                log_records.append(record)
+        # Should have two records: start and finish
+        assert len(caplog.records) == 2
+        assert "Starting" in caplog.records[0].getMessage()
+        assert "Finished" in caplog.records[1].getMessage()
 
-        handler = TestHandler()
-        logger.addHandler(handler)
+    def test_log_operation_failure(self, caplog):
+        """Test log_operation logs exception on failure."""
+        caplog.set_level(logging.DEBUG, logger="test")
+        logger = logging.getLogger("test")
 
-        try:
+        with pytest.raises(ValueError):
             with log_operation(
                 logger, tool_name="test_tool", request_id="req-1", query_params=None, event="test_event"
             ):
-                pass
-
-            # Should have two records: start and finish
-            assert len(log_records) == 2
-            assert "Starting" in log_records[0].getMessage()
-            assert "Finished" in log_records[1].getMessage()
-        finally:
-            logger.removeHandler(handler)
-
-    def test_log_operation_failure(self):
-        """Test log_operation logs exception on failure."""
-        logger = logging.getLogger("test")
-        logger.setLevel(logging.INFO)
+                raise ValueError("Test error")
 
-        log_records = []
+        # Should have start and exception record
+        assert len(caplog.records) == 2
+        assert "Starting" in caplog.records[0].getMessage()
+        assert "failed" in caplog.records[1].getMessage()
 
-        class TestHandler(logging.Handler):
-            def emit(self, record):
-                log_records.append(record)
-
-        handler = TestHandler()
-        logger.addHandler(handler)
-
-        try:
-            with pytest.raises(ValueError):
-                with log_operation(
-                    logger, tool_name="test_tool", request_id="req-1", query_params=None, event="test_event"
-                ):
-                    raise ValueError("Test error")
-
-            # Should have start and exception record
-            assert len(log_records) == 2
-            assert "Starting" in log_records[0].getMessage()
-            assert "failed" in log_records[1].getMessage()
-        finally:
-            logger.removeHandler(handler)
-
-    def test_log_operation_measures_time(self):
+    def test_log_operation_measures_time(self, caplog):
         """Test log_operation measures elapsed time."""
+        caplog.set_level(logging.DEBUG, logger="test")
         logger = logging.getLogger("test")
-        logger.setLevel(logging.INFO)
-
-        log_records = []
 
-        class TestHandler(logging.Handler):
-            def emit(self, record):
-                log_records.append(record)
-
-        handler = TestHandler()
-        logger.addHandler(handler)
-
-        try:
-            with log_operation(
-                logger, tool_name="test_tool", request_id="req-1", query_params=None, event="test_event"
-            ):
-                time.sleep(0.01)
+        with log_operation(
+            logger, tool_name="test_tool", request_id="req-1", query_params=None, event="test_event"
+        ):
+            time.sleep(0.01)
 
-            # Check finish record has elapsed_ms
-            finish_record = log_records[1]
-            assert hasattr(finish_record, "elapsed_ms")
-            assert finish_record.elapsed_ms >= 10
-        finally:
-            logger.removeHandler(handler)
+        # Check finish record has elapsed_ms
+        finish_record = caplog.records[1]
+        assert hasattr(finish_record, "elapsed_ms")
+        assert finish_record.elapsed_ms >= 10
 
-    def test_log_operation_with_metadata(self):
+    def test_log_operation_with_metadata(self, caplog):
         """Test log_operation includes tool_name and other metadata."""
+        caplog.set_level(logging.DEBUG, logger="test")
         logger = logging.getLogger("test")
-        logger.setLevel(logging.INFO)
-
-        log_records = []
-
-        class TestHandler(logging.Handler):
-            def emit(self, record):
-                log_records.append(record)
 
-        handler = TestHandler()
-        logger.addHandler(handler)
-
-        try:
-            with log_operation(
-                logger,
-                tool_name="my_tool",
-                request_id="req-123",
-                query_params={"q": "test"},
-                event="operation_event",
-            ):
-                pass
+        with log_operation(
+            logger,
+            tool_name="my_tool",
+            request_id="req-123",
+            query_params={"q": "test"},
+            event="operation_event",
+        ):
+            pass
 
-            start_record = log_records[0]
-            assert start_record.tool_name == "my_tool"
-            assert start_record.request_id == "req-123"
-            assert start_record.query_params == {"q": "test"}
-            assert start_record.event == "operation_event"
-        finally:
-            logger.removeHandler(handler)
+        start_record = caplog.records[0]
+        assert start_record.tool_name == "my_tool"
+        assert start_record.request_id == "req-123"
+        assert start_record.query_params == {"q": "test"}
+        assert start_record.event == "operation_event"
 
-    def test_log_operation_with_extra_context(self):
+    def test_log_operation_with_extra_context(self, caplog):
         """Test log_operation includes extra context."""
+        caplog.set_level(logging.DEBUG, logger="test")
         logger = logging.getLogger("test")
-        logger.setLevel(logging.INFO)
-
-        log_records = []
-
-        class TestHandler(logging.Handler):
-            def emit(self, record):
-                log_records.append(record)
 
-        handler = TestHandler()
-        logger.addHandler(handler)
-
-        try:
-            with log_operation(
-                logger,
-                tool_name="my_tool",
-                request_id="req-123",
-                query_params=None,
-                event="operation_event",
-                extra_context={"custom_key": "custom_value"},
-            ):
-                pass
+        with log_operation(
+            logger,
+            tool_name="my_tool",
+            request_id="req-123",
+            query_params=None,
+            event="operation_event",
+            extra_context={"custom_key": "custom_value"},
+        ):
+            pass
 
-            start_record = log_records[0]
-            assert start_record.custom_key == "custom_value"
-        finally:
-            logger.removeHandler(handler)
+        start_record = caplog.records[0]
+        assert start_record.custom_key == "custom_value"
 
-    def test_log_operation_with_correlation_id(self):
+    def test_log_operation_with_correlation_id(self, caplog):
         """Test log_operation includes correlation ID from context."""
+        caplog.set_level(logging.DEBUG, logger="test")
         logger = logging.getLogger("test")
-        logger.setLevel(logging.INFO)
-
-        log_records = []
-
-        class TestHandler(logging.Handler):
-            def emit(self, record):
-                log_records.append(record)
-
-        handler = TestHandler()
-        logger.addHandler(handler)
-
         correlation_token = correlation_id_ctx.set("corr-789")
 
         try:
@@ -842,26 +800,15 @@ class TestLogOperationContextManager:
             ):
                 pass
 
-            start_record = log_records[0]
+            start_record = caplog.records[0]
             assert start_record.correlation_id == "corr-789"
         finally:
             correlation_id_ctx.reset(correlation_token)
-            logger.removeHandler(handler)
 
-    def test_log_operation_with_metadata_context(self):
+    def test_log_operation_with_metadata_context(self, caplog):
         """Test log_operation includes metadata from request context."""
+        caplog.set_level(logging.DEBUG, logger="test")
         logger = logging.getLogger("test")
-        logger.setLevel(logging.INFO)
-
-        log_records = []
-
-        class TestHandler(logging.Handler):
-            def emit(self, record):
-                log_records.append(record)
-
-        handler = TestHandler()
-        logger.addHandler(handler)
-
         metadata_token = request_metadata_ctx.set(
             {"tool_name": "context_tool", "citation": "410 U.S. 113"}
         )
@@ -872,32 +819,22 @@ class TestLogOperationContextManager:
             ):
                 pass
 
-            start_record = log_records[0]
+            start_record = caplog.records[0]
             assert start_record.tool_name == "context_tool"
             assert start_record.citation == "410 U.S. 113"
         finally:
             request_metadata_ctx.reset(metadata_token)
-            logger.removeHandler(handler)
 
 
 class TestLoggingIntegration:
     """Integration tests combining multiple logging components."""
 
-    def test_decorator_with_log_operation(self):
+    def test_decorator_with_log_operation(self, caplog):
         """Test tool_logging decorator works with log_operation context manager."""
+        caplog.set_level(logging.DEBUG, logger="test")
         logger = logging.getLogger("test")
-        logger.setLevel(logging.INFO)
 
-        log_records = []
-
-        class TestHandler(logging.Handler):
-            def emit(self, record):
-                log_records.append(record)
-
-        handler = TestHandler()
-        logger.addHandler(handler)
-
-        try:
+        with patch("app.logging_config.logging.getLogger", return_value=logger):
             @tool_logging("test_tool")
             def test_func():
                 with log_operation(
@@ -909,39 +846,33 @@ class TestLoggingIntegration:
                 ):
                     return "result"
 
-            with patch("app.logging_config.logging.getLogger", return_value=logger):
-                result = test_func()
+            result = test_func()
 
-            assert result == "result"
-            # Should have multiple log records from both decorator and context manager
-            assert len(log_records) > 0
-        finally:
-            logger.removeHandler(handler)
+        assert result == "result"
+        # Should have records from both the decorator and the context manager
+        messages = [record.getMessage() for record in caplog.records]
+        assert "Tool call started" in messages
+        assert "Starting inner_event" in messages
+        assert "Finished inner_event" in messages
+        assert "Tool call completed" in messages
 
     def test_json_formatter_with_all_fields(self):
         """Test JsonFormatter with all possible fields populated."""
-        formatter = JsonFormatter()
         correlation_token = correlation_id_ctx.set("all-fields-test")
         metadata_token = request_metadata_ctx.set(
             {"tool_name": "integration_tool", "citation": "505 U.S. 833"}
         )
 
         try:
-            record = logging.LogRecord(
-                name="test.logger",
-                level=logging.INFO,
-                pathname="test.py",
-                lineno=10,
+            record = _make_record(
                 msg="Integration test",
-                args=(),
-                exc_info=None,
+                elapsed_ms=42.5,
+                event="test_event",
+                query_params={"search": "roe"},
+                citation_count=3,
             )
-            record.elapsed_ms = 42.5
-            record.event = "test_event"
-            record.query_params = {"search": "roe"}
-            record.citation_count = 3
 
-            result = formatter.format(record)
+            result = _FORMATTER.format(record)
             data = json.loads(result)
 
             assert data["level"] == "INFO"
@@ -3,32 +3,47 @@
 from __future__ import annotations
 
 import json
-from pathlib import Path
+from collections.abc import Iterator
 
 import pytest
 
 import app.cache as cache_module
-from app.cache import CacheManager, CacheType
-from app import management
 from app import management
 from app.cache import CacheManager, CacheType
 
 
+@pytest.fixture(scope="module")
+def _module_cache_manager(tmp_path_factory: pytest.TempPathFactory) -> Iterator[CacheManager]:
+    """Build one temporary cache manager and install it as the global for this module."""
+    manager = CacheManager(base_dir=tmp_path_factory.mktemp("cache"))
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(cache_module, "_cache_manager", manager)
+        yield manager
+
+
 @pytest.fixture()
-def temp_cache_manager(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> CacheManager:
-    """Provide a cache manager backed by a temporary directory."""
-    manager = CacheManager(base_dir=tmp_path / "cache")
-    monkeypatch.setattr(cache_module, "_cache_manager", manager)
-    return manager
+def temp_cache_manager(_module_cache_manager: CacheManager) -> CacheManager:
+    """Provide the shared temporary cache manager, emptied and with fresh stats."""
+    _module_cache_manager.clear()
+    for key in _module_cache_manager.stats:
+        _module_cache_manager.stats[key] = 0
+    return _module_cache_manager
+
+
+def _seed(manager: CacheManager, cache_type: CacheType, count: int) -> None:
+    """Create ``count`` placeholder cache files without going through ``CacheManager.set``."""
+    cache_dir = manager.base_dir / cache_type.value
+    for index in range(count):
+        (cache_dir / f"seed_{index}.json").write_bytes(b"{}")
 
 
-def test_cache_stats_command(temp_cache_manager: CacheManager, capsys: pytest.CaptureFixture[str]) -> None:
+def test_cache_stats_command(temp_cache_manager: CacheManager, capsysbinary: pytest.CaptureFixture[bytes]) -> None:
     """cache:stats should return JSON stats with file counts."""
-    temp_cache_manager.set(CacheType.METADATA, {"id": 1}, {"hello": "world"})
+    _seed(temp_cache_manager, CacheType.METADATA, 1)
 
     exit_code = management.run(["cache:stats"])
 
-    captured = capsys.readouterr()
+    captured = capsysbinary.readouterr()
     assert exit_code == 0
 
     payload = json.loads(captured.out)
@@ -38,14 +53,14 @@ def test_cache_stats_command(temp_cache_manager: CacheManager, capsys: pytest.Ca
     assert payload["enabled"] is True
 
 
-def test_cache_clear_command(temp_cache_manager: CacheManager, capsys: pytest.CaptureFixture[str]) -> None:
+def test_cache_clear_command(temp_cache_manager: CacheManager, capsysbinary: pytest.CaptureFixture[bytes]) -> None:
     """cache:clear should remove files for the selected cache type."""
     temp_cache_manager.set(CacheType.METADATA, {"id": 2}, {"case": "one"})
     temp_cache_manager.set(CacheType.SEARCH, {"q": "two"}, {"result": "two"})
 
     exit_code = management.run(["cache:clear", "--type", "metadata"])
 
-    captured = capsys.readouterr()
+    captured = capsysbinary.readouterr()
     payload = json.loads(captured.out)
 
     assert exit_code == 0
@@ -55,7 +70,7 @@ def test_cache_clear_command(temp_cache_manager: CacheManager, capsys: pytest.Ca
 
     # Clear everything
     exit_code_all = management.run(["cache:clear"])
-    captured_all = capsys.readouterr()
+    captured_all = capsysbinary.readouterr()
     payload_all = json.loads(captured_all.out)
 
     assert exit_code_all == 0
@@ -63,14 +78,14 @@ def test_cache_clear_command(temp_cache_manager: CacheManager, capsys: pytest.Ca
     assert temp_cache_manager.get(CacheType.SEARCH, {"q": "two"}) is None
 
 
-@pytest.mark.parametrize("bad_type", ["invalid", "metadata ", "TEXT"])
 def test_cache_clear_invalid_type(
-    bad_type: str, temp_cache_manager: CacheManager, capsys: pytest.CaptureFixture[str]
+    temp_cache_manager: CacheManager, capsysbinary: pytest.CaptureFixture[bytes]
 ) -> None:
-    """Invalid cache type should return a non-zero exit status."""
-    exit_code = management.run(["cache:clear", "--type", bad_type])
+    """Invalid cache types should return a non-zero exit status."""
+    for bad_type in ("invalid", "metadata ", "TEXT"):
+        exit_code = management.run(["cache:clear", "--type", bad_type])
 
-    captured = capsys.readouterr()
+        captured = capsysbinary.readouterr()
 
-    assert exit_code == 1
-    assert "Invalid cache type" in captured.err
+        assert exit_code == 1, bad_type
+        assert b"Invalid cache type" in captured.err, bad_type
@@ -1,103 +1,151 @@
 """Tests for the MCP Client."""
 
-import asyncio
-from datetime import timedelta
+from collections.abc import Callable
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
 import pytest
 
-from app.mcp_client import CircuitBreakerOpenError, CourtListenerClient, get_client
-from app.config import Settings
-from app.cache import CacheManager, CacheType
 from app.cache import CacheManager, CacheType
 from app.config import Settings
 from app.mcp_client import CircuitBreakerOpenError, CourtListenerClient
 
+_REQ = httpx.Request("GET", "search/")
+_RESP_200 = httpx.Response(200, json={"ok": True}, request=_REQ)
+_RESP_429 = httpx.Response(429, request=_REQ)
+_RESP_503 = httpx.Response(503, request=_REQ)
 
-@pytest.fixture
-def client_instance():
-    """Create a client instance for testing."""
-    # Use settings with dummy key to trigger auth headers logic
-    settings = Settings(courtlistener_api_key="dummy_key")
-    # Reset singleton
-    with patch("app.mcp_client._client", None):
-        client = CourtListenerClient(settings)
-        # Mock the CacheManager to avoid disk I/O
-        client.cache_manager = MagicMock(spec=CacheManager)
-        # Default behavior: cache miss
-        client.cache_manager.get.return_value = None
-        yield client
-        # Clean up
-        if hasattr(client, 'client'):
-            # It's an async client, we can't easily close it in a sync fixture
-            # but we can suppress the warning or ignore it.
-            pass
 
+def _err_429() -> httpx.HTTPStatusError:
+    """New rate-limit error for each raise; a raised instance carries its traceback."""
+    return httpx.HTTPStatusError("error", request=_REQ, response=_RESP_429)
 
-@pytest.mark.asyncio
-async def test_search_opinions(client_instance):
-    """Test searching for opinions."""
-    # Mock the HTTP response
-    mock_response = MagicMock()
-    mock_response.json.return_value = {"results": [{"caseName": "Test Case"}]}
-    mock_response.status_code = 200
-    mock_response.raise_for_status = MagicMock()
 
-    client_instance.client.request = MagicMock(return_value=mock_response)
+def _err_503() -> httpx.HTTPStatusError:
+    """New service-unavailable error for each raise, like ``_err_429``."""
+    return httpx.HTTPStatusError("error", request=_REQ, response=_RESP_503)
 
-    # We need to mock the coroutine return
-    async def mock_request(*args, **kwargs):
-        return mock_response
 
-    client_instance.client.request = mock_request
+async def _fast_sleep(_delay: float) -> None:
+    """Stand-in for ``asyncio.sleep`` that skips retry backoff without recording calls."""
+    return None
 
-    result = await client_instance.search_opinions(q="test query")
 
-    assert result["results"][0]["caseName"] == "Test Case"
+def make_json_response(payload: dict, status: int = 200) -> httpx.Response:
+    """Build a real httpx response carrying ``payload`` as its JSON body."""
+    return httpx.Response(status, json=payload, request=_REQ)
 
-    # Verify cache interaction
-    client_instance.cache_manager.get.assert_called_with(
-        CacheType.SEARCH,
-        {'q': 'test query', 'type': 'o', 'order_by': 'score desc', 'hit': 20}
-    )
-    client_instance.cache_manager.set.assert_called()
 
+def async_return(response: httpx.Response) -> AsyncMock:
+    """Build an awaitable ``client.request`` replacement that always returns ``response``."""
+    return AsyncMock(return_value=response)
 
-@pytest.mark.asyncio
-async def test_search_opinions_error(client_instance):
-    """Test error handling in search."""
 
-    async def mock_request(*args, **kwargs):
-        raise httpx.HTTPStatusError("Error", request=None, response=MagicMock(status_code=500))
+def route_through(client: CourtListenerClient, handler: Callable[[httpx.Request], httpx.Response]) -> None:
+    """Serve the client's HTTP calls from ``handler`` via ``httpx.MockTransport``.
 
-    client_instance.client.request = mock_request
+    Requests go through httpx's real request building and ``raise_for_status``
+    path, so handlers return plain responses (including error statuses).
+    The ``client_instance`` fixture closes the installed client on teardown.
+    """
+    client.client = httpx.AsyncClient(base_url=client.base_url, transport=httpx.MockTransport(handler))
 
-    with pytest.raises(httpx.HTTPStatusError):
-        await client_instance.search_opinions(q="error query")
+
+def _pluck(data: Any, path: tuple[str | int, ...]) -> Any:
+    """Follow a sequence of keys/indexes into nested JSON data."""
+    for step in path:
+        data = data[step]
+    return data
+
+
+@pytest.fixture
+async def client_instance(make_client):
+    """Create a client instance for testing."""
+    # The shared settings carry an API key to trigger auth headers logic
+    # Reset singleton
+    with patch("app.mcp_client._client", None):
+        client = make_client()
+        # Mock the CacheManager to avoid disk I/O
+        client.cache_manager = MagicMock(spec=CacheManager)
+        # Default behavior: cache miss
+        client.cache_manager.get.return_value = None
+        yield client
+        # Clean up: release the MockTransport client installed by route_through
+        await client.close()
 
 
 @pytest.mark.asyncio
-async def test_get_opinion(client_instance):
-    """Test getting a specific opinion."""
-    mock_response = MagicMock()
-    mock_response.json.return_value = {"id": 123, "plain_text": "Opinion text"}
-    mock_response.status_code = 200
-    mock_response.raise_for_status = MagicMock()
+@pytest.mark.parametrize(
+    ("method", "args", "kwargs", "payload", "cache_type", "cache_key", "expected"),
+    [
+        pytest.param(
+            "search_opinions",
+            (),
+            {"q": "test query"},
+            {"results": [{"caseName": "Test Case"}]},
+            CacheType.SEARCH,
+            {"q": "test query", "type": "o", "order_by": "score desc", "hit": 20},
+            {("results", 0, "caseName"): "Test Case"},
+            id="search_opinions",
+        ),
+        pytest.param(
+            "get_opinion",
+            (123,),
+            {},
+            {"id": 123, "plain_text": "Opinion text"},
+            CacheType.METADATA,
+            {"opinion_id": 123},
+            {("id",): 123},
+            id="get_opinion",
+        ),
+        pytest.param(
+            "lookup_citation",
+            ("410 U.S. 113",),
+            {},
+            {"results": [{"caseName": "Cited Case", "citation": ["410 U.S. 113"]}]},
+            CacheType.SEARCH,
+            {"citation_lookup": "410 U.S. 113"},
+            {("caseName",): "Cited Case"},
+            id="lookup_citation",
+        ),
+        pytest.param(
+            "find_citing_cases",
+            ("410 U.S. 113",),
+            {},
+            # Both query variants return the same case; it is deduplicated by id
+            {"results": [{"id": 1, "caseName": "Citing Case"}]},
+            CacheType.SEARCH,
+            {"citing_cases": "410 U.S. 113", "limit": 100},
+            {("results",): [{"id": 1, "caseName": "Citing Case"}], ("failed_requests",): []},
+            id="find_citing_cases",
+        ),
+    ],
+)
+async def test_successful_request_is_cached(
+    client_instance, method, args, kwargs, payload, cache_type, cache_key, expected
+):
+    """A successful API call should return the parsed payload and populate the cache."""
+    client_instance.client.request = async_return(make_json_response(payload))
+
+    result = await getattr(client_instance, method)(*args, **kwargs)
+
+    for path, value in expected.items():
+        assert _pluck(result, path) == value
+    client_instance.cache_manager.get.assert_called_with(cache_type, cache_key)
+    client_instance.cache_manager.set.assert_called()
 
-    async def mock_request(*args, **kwargs):
-        return mock_response
 
-    client_instance.client.request = mock_request
+@pytest.mark.asyncio
+async def test_search_opinions_error(client_instance, monkeypatch):
+    """Test error handling in search."""
+    monkeypatch.setattr("asyncio.sleep", _fast_sleep)
+    route_through(client_instance, lambda request: httpx.Response(500))
 
-    result = await client_instance.get_opinion(123)
-    assert result["id"] == 123
+    with pytest.raises(httpx.HTTPStatusError) as exc_info:
+        await client_instance.search_opinions(q="error query")
 
-    # Verify cache
-    client_instance.cache_manager.get.assert_called_with(
-        CacheType.METADATA, {"opinion_id": 123}
-    )
-    client_instance.cache_manager.set.assert_called()
+    assert exc_info.value.response.status_code == 500
 
 
 @pytest.mark.asyncio
@@ -123,88 +171,26 @@ async def test_get_opinion_full_text(client_instance):
     client_instance.cache_manager.set.assert_called()
 
 
-@pytest.mark.asyncio
-async def test_lookup_citation(client_instance):
-    """Test looking up a citation."""
-    mock_response = MagicMock()
-    mock_response.json.return_value = {
-        "results": [
-            {"caseName": "Cited Case", "citation": ["410 U.S. 113"]}
-        ]
-    }
-    mock_response.status_code = 200
-    mock_response.raise_for_status = MagicMock()
-
-    async def mock_request(*args, **kwargs):
-        return mock_response
-
-    client_instance.client.request = mock_request
-
-    result = await client_instance.lookup_citation("410 U.S. 113")
-    assert result["caseName"] == "Cited Case"
-
-
 @pytest.mark.asyncio
 async def test_lookup_citation_no_results(client_instance):
     """Test lookup with no results."""
-    mock_response = MagicMock()
-    mock_response.json.return_value = {"results": []}
-    mock_response.status_code = 200
-    mock_response.raise_for_status = MagicMock()
-
-    async def mock_request(*args, **kwargs):
-        return mock_response
-
-    client_instance.client.request = mock_request
+    client_instance.client.request = async_return(make_json_response({"results": []}))
 
     result = await client_instance.lookup_citation("Invalid Citation")
     assert "error" in result
 
 
-@pytest.mark.asyncio
-async def test_find_citing_cases(client_instance):
-    """Test finding citing cases."""
-    mock_response = MagicMock()
-    mock_response.json.return_value = {"results": [{"caseName": "Citing Case"}]}
-    mock_response.status_code = 200
-    mock_response.raise_for_status = MagicMock()
-
-    async def mock_request(*args, **kwargs):
-        return mock_response
-
-    client_instance.client.request = mock_request
-
-    result = await client_instance.find_citing_cases("410 U.S. 113")
-    assert len(result["results"]) == 1
-    assert result["results"][0]["caseName"] == "Citing Case"
-    assert result["failed_requests"] == []
-
-    # Verify cache
-    client_instance.cache_manager.get.assert_called_with(
-        CacheType.SEARCH, {"citing_cases": "410 U.S. 113", "limit": 100}
-    )
-
-
 @pytest.mark.asyncio
 async def test_find_citing_cases_retry(client_instance):
     """Test finding citing cases with retry logic."""
     # First attempt (quoted query) fails to return results (returns empty list), second (unquoted) succeeds
 
-    async def mock_request(method, url, params=None, **kwargs):
-        if params and '"410 U.S. 113"' in params.get('q', ''):
-             mock_empty = MagicMock()
-             mock_empty.json.return_value = {"results": []}
-             mock_empty.status_code = 200
-             mock_empty.raise_for_status = MagicMock()
-             return mock_empty
-        else:
-             mock_success = MagicMock()
-             mock_success.json.return_value = {"results": [{"caseName": "Success"}]}
-             mock_success.status_code = 200
-             mock_success.raise_for_status = MagicMock()
-             return mock_success
-
-    client_instance.client.request = mock_request
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.params["q"] == '"410 U.S. 113"':
+            return httpx.Response(200, json={"results": []})
+        return httpx.Response(200, json={"results": [{"caseName": "Success"}]})
+
+    route_through(client_instance, handler)
 
     result = await client_instance.find_citing_cases("410 U.S. 113")
 
@@ -227,29 +213,13 @@ async def test_close(client_instance):
 
 
 @pytest.mark.asyncio
-async def test_retry_and_backoff_for_rate_limits(monkeypatch):
+async def test_retry_and_backoff_for_rate_limits(make_client, monkeypatch):
     """429/503 responses should be retried with capped exponential backoff."""
 
-    settings = Settings(
-        courtlistener_api_key="token",
-        courtlistener_retry_attempts=4,
-        courtlistener_retry_backoff=15,
-    )
-    client = CourtListenerClient(settings)
+    client = make_client(courtlistener_retry_attempts=4, courtlistener_retry_backoff=15)
 
-    responses = [
-        httpx.HTTPStatusError(
-            "error",
-            request=httpx.Request("GET", "search/"),
-            response=httpx.Response(503, request=httpx.Request("GET", "search/")),
-        ),
-        httpx.HTTPStatusError(
-            "error",
-            request=httpx.Request("GET", "search/"),
-            response=httpx.Response(429, request=httpx.Request("GET", "search/")),
-        ),
-        httpx.Response(200, json={"ok": True}, request=httpx.Request("GET", "search/")),
-    ]
+    # Fixed sequence: two retryable failures, then success
+    responses = (_err_503(), _err_429(), _RESP_200)
 
     request_mock = AsyncMock(side_effect=responses)
     client.client.request = request_mock
@@ -265,36 +235,31 @@ async def test_retry_and_backoff_for_rate_limits(monkeypatch):
     sleep_durations = [call.args[0] for call in sleep_mock.await_args_list]
     assert sleep_durations  # ensure backoff invoked
     assert max(sleep_durations) <= 30
-    assert sleep_durations[0] >= settings.courtlistener_retry_backoff
+    assert sleep_durations[0] >= client.settings.courtlistener_retry_backoff
 
 
+@pytest.mark.asyncio
 @pytest.mark.parametrize("status_code", [400, 401, 404])
-def test_client_errors_not_retried(status_code, monkeypatch):
+async def test_client_errors_not_retried(status_code, make_client, monkeypatch):
     """Client errors should not trigger retries."""
 
-    async def _run_test():
-        settings = Settings(courtlistener_api_key="token", courtlistener_retry_attempts=5)
-        client = CourtListenerClient(settings)
-
-        error = httpx.HTTPStatusError(
-            "client error",
-            request=httpx.Request("GET", "search/"),
-            response=httpx.Response(status_code, request=httpx.Request("GET", "search/")),
-        )
+    client = make_client(courtlistener_retry_attempts=5)
 
-        request_mock = AsyncMock(side_effect=error)
-        client.client.request = request_mock
+    error = httpx.HTTPStatusError(
+        "client error", request=_REQ, response=httpx.Response(status_code, request=_REQ)
+    )
 
-        sleep_mock = AsyncMock()
-        monkeypatch.setattr("asyncio.sleep", sleep_mock)
+    request_mock = AsyncMock(side_effect=error)
+    client.client.request = request_mock
 
-        with pytest.raises(httpx.HTTPStatusError):
-            await client._request("GET", "search/")
+    sleep_mock = AsyncMock()
+    monkeypatch.setattr("asyncio.sleep", sleep_mock)
 
-        assert request_mock.await_count == 1
-        sleep_mock.assert_not_awaited()
+    with pytest.raises(httpx.HTTPStatusError):
+        await client._request("GET", "search/")
 
-    asyncio.run(_run_test())
+    assert request_mock.await_count == 1
+    sleep_mock.assert_not_awaited()
 
 
 def test_timeout_configuration_applied():
@@ -322,40 +287,18 @@ def test_timeout_configuration_applied():
 
 
 @pytest.mark.asyncio
-async def test_partial_results_track_failures(monkeypatch):
+async def test_partial_results_track_failures(make_client, monkeypatch):
     """Failed query attempts should be surfaced alongside results with reduced confidence."""
 
-    settings = Settings(
-        courtlistener_api_key="token",
-        courtlistener_retry_attempts=1,
-        courtlistener_retry_backoff=0,
-    )
-    client = CourtListenerClient(settings)
+    client = make_client(courtlistener_retry_attempts=1, courtlistener_retry_backoff=0)
     client.cache_manager = MagicMock()
     client.cache_manager.get.return_value = None
 
-    error = httpx.HTTPStatusError(
-        "temporary error",
-        request=httpx.Request("GET", "search/"),
-        response=httpx.Response(503, request=httpx.Request("GET", "search/")),
-    )
-
-    success_response = httpx.Response(
-        200,
-        json={"results": [{"id": 1, "caseName": "Recovered"}]},
-        request=httpx.Request("GET", "search/"),
-    )
-
-    async def request_side_effect(*args, **kwargs):
-        if not request_side_effect.failed_once:
-            request_side_effect.failed_once = True
-            raise error
-        return success_response
-
-    request_side_effect.failed_once = False
+    success_response = make_json_response({"results": [{"id": 1, "caseName": "Recovered"}]})
 
-    client.client.request = AsyncMock(side_effect=request_side_effect)
-    monkeypatch.setattr("asyncio.sleep", AsyncMock())
+    # The quoted query fails, the unquoted fallback succeeds
+    client.client.request = AsyncMock(side_effect=[_err_503(), success_response])
+    monkeypatch.setattr("asyncio.sleep", _fast_sleep)
 
     result = await client.find_citing_cases("410 U.S. 113", limit=10)
 
@@ -366,30 +309,17 @@ async def test_partial_results_track_failures(monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_circuit_breaker_transitions(monkeypatch):
+async def test_circuit_breaker_transitions(make_client, monkeypatch):
     """Circuit breaker should open after failures, allow half-open, and reset after success."""
 
-    settings = Settings(
-        courtlistener_api_key="token",
-        courtlistener_retry_attempts=1,
-        courtlistener_retry_backoff=0,
-    )
-    client = CourtListenerClient(settings)
-
-    success_response = httpx.Response(200, json={"ok": True}, request=httpx.Request("GET", "search/"))
+    client = make_client(courtlistener_retry_attempts=1, courtlistener_retry_backoff=0)
 
-    async def request_side_effect(*args, **kwargs):
-        request_side_effect.call_count += 1
-        if request_side_effect.call_count <= 5:
-            raise httpx.RequestError("boom")
-        if request_side_effect.call_count == 6:
-            return success_response
-        raise httpx.RequestError("boom-again")
-
-    request_side_effect.call_count = 0
-
-    client.client.request = AsyncMock(side_effect=request_side_effect)
-    monkeypatch.setattr("asyncio.sleep", AsyncMock())
+    # Five failures open the circuit, the half-open probe succeeds, then one more failure
+    client.client.request = AsyncMock(
+        side_effect=[httpx.RequestError("boom") for _ in range(5)]
+        + [_RESP_200, httpx.RequestError("boom-again")]
+    )
+    monkeypatch.setattr("asyncio.sleep", _fast_sleep)
 
     for _ in range(5):
         with pytest.raises(httpx.RequestError):
@@ -402,7 +332,7 @@ async def test_circuit_breaker_transitions(monkeypatch):
 
     assert client.client.request.await_count == 5
 
-    client.circuit_open_until = client.circuit_open_until - timedelta(seconds=61)
+    client.circuit_open_until -= 61
 
     response = await client._request("GET", "search/")
     assert response.status_code == 200
@@ -52,9 +52,8 @@ def mock_client_funcs(mocker):
 
 @pytest.fixture
 def mock_classifier(mocker):
-    """Mock the TreatmentClassifier."""
-    classifier_mock = mocker.patch("app.tools.network.TreatmentClassifier")
-    instance = classifier_mock.return_value
+    """Mock the shared treatment classifier."""
+    instance = mocker.patch("app.tools.network.classifier")
 
     # Setup treatment analysis mock
     mock_analysis = MagicMock()
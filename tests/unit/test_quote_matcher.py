@@ -16,11 +16,30 @@ def test_normalize_text(matcher):
     text = '<p>Hello</p> "World"'
     assert matcher.normalize_text(text) == 'Hello "World"'
 
+    text = "<p>The\n<br/>\tcourt\u2019s</p>   \u201cholding\u201d "
+    assert matcher.normalize_text(text) == 'The court\'s "holding"'
+
+def test_source_normalization_is_shared_between_passes(matcher, mocker):
+    spy = mocker.spy(matcher, "normalize_text")
+    source = "The Constitution of the United States."
+
+    result = matcher.verify_quote("Constitution for the United", source, "citation")
+
+    # The exact and fuzzy passes reuse one view of the source
+    assert result.found
+    assert [call.args[0] for call in spy.call_args_list].count(source) == 1
+
 def test_calculate_similarity(matcher):
     assert matcher.calculate_similarity("abc", "abc") == 1.0
     assert matcher.calculate_similarity("abc", "def") == 0.0
     assert 0.0 < matcher.calculate_similarity("abc", "abd") < 1.0
 
+def test_calculate_similarity_without_rapidfuzz(matcher, monkeypatch):
+    monkeypatch.setattr("app.analysis.quote_matcher.fuzz", None)
+    assert matcher.calculate_similarity("abc", "abc") == 1.0
+    assert matcher.calculate_similarity("abc", "def") == 0.0
+    assert matcher.calculate_similarity("abc", "abd") == pytest.approx(2 / 3)
+
 def test_find_quote_exact(matcher):
     source = "This is a test of the emergency broadcast system."
     quote = "test of the emergency"
@@ -39,6 +58,17 @@ def test_find_quote_exact_case_insensitive(matcher):
     assert len(matches) == 1
     assert matches[0].exact_match
 
+def test_find_quote_exact_reports_each_occurrence(matcher):
+    source = "Due process. DUE PROCESS. due process."
+
+    matches = matcher.find_quote_exact("due process", source)
+    assert [(m.position, m.matched_text) for m in matches] == [
+        (0, "Due process"),
+        (13, "DUE PROCESS"),
+        (26, "due process"),
+    ]
+    assert matches[1].context_before == "Due process. "
+
 def test_find_quote_fuzzy(matcher):
     source = "The quick brown fox jumps over the lazy dog."
     quote = "quick brown fox jumped over" # "jumps" vs "jumped"
@@ -48,6 +78,31 @@ def test_find_quote_fuzzy(matcher):
     assert not matches[0].exact_match
     assert matches[0].similarity > 0.8
 
+@pytest.mark.parametrize("use_rapidfuzz", [True, False])
+def test_find_quote_fuzzy_skips_windows_without_shared_characters(
+    matcher, monkeypatch, use_rapidfuzz
+):
+    if use_rapidfuzz:
+        pytest.importorskip("rapidfuzz")
+    else:
+        monkeypatch.setattr("app.analysis.quote_matcher.fuzz", None)
+    scored: list[str] = []
+    similarity_to = matcher._similarity_to
+
+    def counting_similarity_to(text, min_similarity):
+        score = similarity_to(text, min_similarity)
+        return lambda candidate: scored.append(candidate) or score(candidate)
+
+    monkeypatch.setattr(matcher, "_similarity_to", counting_similarity_to)
+
+    matches = matcher.find_quote_fuzzy("quick brown fox", "zzzz " * 20 + "quick brown fix")
+
+    assert len(matches) == 1
+    assert "quick brown" in matches[0].matched_text
+    assert matches[0].similarity >= matcher.fuzzy_threshold
+    # Only windows overlapping the tail can reach the threshold
+    assert 0 < len(scored) < 20
+
 def test_verify_quote_exact(matcher):
     source = "The Constitution of the United States."
     quote = "Constitution of the United"
@@ -67,6 +122,41 @@ def test_verify_quote_fuzzy(matcher):
     assert result.similarity > 0.8
     assert len(result.warnings) > 0
 
+_LONG_SOURCE = (
+    "The right of the people to be secure in their persons, houses, papers, and "
+    "effects, against unreasonable searches and seizures, shall not be violated, "
+    "and no Warrants shall issue, but upon probable cause, supported by Oath or "
+    "affirmation, and particularly describing the place to be searched, and the "
+    "persons or things to be seized."
+)
+
+@pytest.mark.parametrize(
+    "quote",
+    [
+        # A few words changed: found above the threshold
+        _LONG_SOURCE.replace("secure", "safe").replace("Oath", "oaths")
+        .replace("particularly", "precisely"),
+        # Heavily reworded: scores near the threshold on both sides
+        _LONG_SOURCE.replace("searches and seizures", "intrusions")
+        .replace("probable cause", "good reason").replace("persons", "people"),
+        # Unrelated text of similar length: not found
+        "Congress shall make no law respecting an establishment of religion, or "
+        "prohibiting the free exercise thereof; or abridging the freedom of speech, "
+        "or of the press; or the right of the people peaceably to assemble, and to "
+        "petition the Government for a redress of grievances, whatever the cost.",
+    ],
+)
+def test_verify_quote_same_result_with_and_without_rapidfuzz(matcher, monkeypatch, quote):
+    pytest.importorskip("rapidfuzz")
+    source = "Preamble text. " + _LONG_SOURCE + " Trailing text."
+    with_rapidfuzz = matcher.verify_quote(quote, source, "citation")
+
+    monkeypatch.setattr("app.analysis.quote_matcher.fuzz", None)
+    without_rapidfuzz = matcher.verify_quote(quote, source, "citation")
+
+    assert without_rapidfuzz.found == with_rapidfuzz.found
+    assert without_rapidfuzz.similarity == with_rapidfuzz.similarity
+
 def test_verify_quote_not_found(matcher):
     source = "The Constitution of the United States."
     quote = "Declaration of Independence"
@@ -85,6 +175,28 @@ def test_find_differences(matcher):
     diffs = matcher._find_differences("Hello World", "Hello Earth")
     assert any("Words differ" in d for d in diffs)
 
+@pytest.mark.parametrize(
+    ("expected", "actual", "reported"),
+    [
+        (
+            "the right to privacy is fundamental",
+            "the right of privacy is not fundamental",
+            ["Words differ: 'to' vs 'of'", "Extra words: 'not'"],
+        ),
+        # Words are aligned on a longest common subsequence; with nothing in
+        # common the whole span is one replacement
+        (
+            "of law that b that that of a",
+            "c",
+            ["Words differ: 'of law that b that that of a' vs 'c'"],
+        ),
+        ("a b c d", "a c d e", ["Missing words: 'b'", "Extra words: 'e'"]),
+    ],
+)
+def test_find_differences_word_alignment(matcher, expected, actual, reported):
+    diffs = matcher._find_differences(expected, actual)
+    assert [d for d in diffs if d.startswith(("Words", "Missing", "Extra"))] == reported
+
 
 # Edge Case Tests for Quote Matcher
 
@@ -115,6 +227,11 @@ def test_quote_matching_unicode_handling(matcher):
     result = matcher.verify_quote(quote, source, "citation")
     assert result.found
 
+    # Decomposed accents (e + combining acute) match precomposed ones
+    result = matcher.verify_quote("cafe\u0301 and re\u0301sume\u0301", source, "citation")
+    assert result.found
+    assert result.exact_match
+
     # Test with em-dashes and other unicode punctuation
     source = "The ruling—which was final—established precedent."
     quote = "The ruling — which was final"
@@ -142,3 +142,81 @@ async def test_get_citing_cases_with_filter(mock_client, mocker):
     assert result["filter_applied"] == "negative"
     assert len(result["citing_cases"]) == 1
     assert result["citing_cases"][0]["treatment"] == "negative"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("treatment_filter", "expected_count"),
+    [("NEUTRAL", 1), ("positive", 0), ("unknown", 1), ("bogus", 1)],
+)
+async def test_get_citing_cases_filter_values(mock_client, treatment_filter, expected_count):
+    """Filters are case-insensitive; unrecognized values do not filter."""
+    result = await get_citing_cases_impl("410 U.S. 113", treatment_filter=treatment_filter)
+
+    assert len(result["citing_cases"]) == expected_count
+
+
+@pytest.mark.asyncio
+async def test_check_case_validity_full_text_fetch_limit(mock_client, mocker):
+    """Up to max_full_text_fetches analyses are enhanced, trying cases in order."""
+    mocker.patch("app.tools.treatment.settings.fetch_full_text_strategy", "always")
+    mocker.patch("app.tools.treatment.settings.max_full_text_fetches", 3)
+    mock_client.find_citing_cases.return_value["results"] = [
+        {"caseName": f"Case {i}", "citation": [f"{i} U.S. {i}"], "opinions": [{"id": i}]}
+        for i in range(1, 8)
+    ]
+    mock_client.find_citing_cases.return_value["results"].insert(
+        0, {"caseName": "No Opinions", "citation": ["9 U.S. 9"]}
+    )
+    full_texts = {
+        1: "In 410 U.S. 113 the holding was overruled.",
+        2: RuntimeError("boom"),
+        3: "",
+        4: "410 U.S. 113 was followed.",
+        5: "410 U.S. 113 was followed.",
+    }
+
+    async def get_full_text(opinion_id, request_id=None):
+        result = full_texts[opinion_id]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    mock_client.get_opinion_full_text.side_effect = get_full_text
+
+    result = await check_case_validity_impl("410 U.S. 113")
+
+    # Failed and empty fetches do not use up the budget; cases 6 and 7 are
+    # never fetched once three analyses have been enhanced
+    assert sorted(
+        call.args[0] for call in mock_client.get_opinion_full_text.await_args_list
+    ) == [1, 2, 3, 4, 5]
+    assert result["total_citing_cases"] == 8
+    assert result["negative_count"] == 1
+    assert result["positive_count"] == 2
+    assert result["warnings"][0]["case_name"] == "Case 1"
+
+@pytest.mark.asyncio
+async def test_check_case_validity_tries_next_case_after_missing_full_text(
+    mock_client, mocker
+):
+    """A fetch returning no text does not stop the next candidate being enhanced."""
+    mocker.patch("app.tools.treatment.settings.fetch_full_text_strategy", "always")
+    mocker.patch("app.tools.treatment.settings.max_full_text_fetches", 1)
+    mock_client.find_citing_cases.return_value["results"] = [
+        {"caseName": f"Case {i}", "citation": [f"{i} U.S. {i}"], "opinions": [{"id": i}]}
+        for i in range(1, 4)
+    ]
+    full_texts = {1: None, 2: "In 410 U.S. 113 the holding was overruled."}
+    mock_client.get_opinion_full_text.side_effect = (
+        lambda opinion_id, request_id=None: full_texts[opinion_id]
+    )
+
+    result = await check_case_validity_impl("410 U.S. 113")
+
+    assert [call.args[0] for call in mock_client.get_opinion_full_text.await_args_list] == [
+        1,
+        2,
+    ]
+    assert result["negative_count"] == 1
+    assert result["warnings"][0]["case_name"] == "Case 2"
@@ -1,5 +1,7 @@
 """Tests for treatment classifier."""
 
+import dataclasses
+
 import pytest
 
 from app.analysis.treatment_classifier import (
@@ -48,6 +50,14 @@ def test_classify_treatment(classifier):
     assert analysis.confidence >= 0.8
     assert "overruled" in analysis.excerpt
 
+def test_signals_are_reported_in_table_order_negatives_first(classifier):
+    text = "Smith v. Jones, 100 U.S. 100, was followed, applied and later reversed."
+
+    signals = classifier.extract_signals(text, "100 U.S. 100")
+
+    # Not text order: summaries show the first signals of each treatment
+    assert [s.signal for s in signals] == ["reversed", "followed", "applied"]
+
 def test_classify_treatment_no_text(classifier):
     citing_case = {
         "caseName": "Citing Case",
@@ -60,6 +70,42 @@ def test_classify_treatment_no_text(classifier):
     assert analysis.treatment_type == TreatmentType.NEUTRAL
     assert analysis.confidence == 0.5
 
+def test_classify_treatment_reuses_analysis_of_same_text(classifier, mocker):
+    spy = mocker.spy(classifier, "extract_signals")
+    full_text = "This case was overruled by Smith v. Jones."
+
+    first = classifier.classify_treatment(
+        {"caseName": "First", "id": 1}, "100 U.S. 100", full_text=full_text
+    )
+    second = classifier.classify_treatment(
+        {"caseName": "Second", "id": 2}, "100 U.S. 100", full_text=full_text
+    )
+
+    assert spy.call_count == 1
+    assert (first.case_name, second.case_name) == ("First", "Second")
+    assert first.signals_found == second.signals_found
+    assert first.signals_found is not second.signals_found
+
+def test_analysis_cache_evicts_least_recently_used_text(mocker):
+    classifier = TreatmentClassifier(cache_size=1)
+    spy = mocker.spy(classifier, "extract_signals")
+    first_text = "This case was overruled by Smith v. Jones."
+    second_text = "This case was followed in Doe v. Roe."
+
+    for text in (first_text, first_text, second_text, first_text):
+        classifier.classify_treatment({"caseName": "Case"}, "100 U.S. 100", full_text=text)
+
+    assert spy.call_count == 3
+    # Entries are keyed by a digest, not by the analyzed text itself
+    assert all(first_text not in key for key in classifier._analyses)
+
+def test_cached_signals_cannot_be_modified(classifier):
+    full_text = "This case was overruled by Smith v. Jones."
+    analysis = classifier.classify_treatment({"caseName": "Case"}, "100 U.S. 100", full_text=full_text)
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        analysis.signals_found[0].signal = "followed"
+
 def test_should_fetch_full_text(classifier):
     analysis = TreatmentAnalysis(
         case_name="Test", case_id="1", citation="1",
@@ -128,6 +174,16 @@ def test_extract_citation_contexts(classifier):
     assert len(contexts) == 1
     assert "Roe v. Wade" in contexts[0][0]
 
+    # Citation mentions come before case-name mentions, each in text order
+    text = "Roe v. Wade, 410 U.S. 113, and later ROE V. WADE and 410\nU.S. 113"
+    contexts = classifier._extract_citation_contexts(text, "410 U.S. 113", window=0)
+    assert [context for context, _ in contexts] == [
+        "410 U.S. 113",
+        "410\nU.S. 113",
+        "Roe v. Wade",
+        "ROE V. WADE",
+    ]
+
 
 # Edge Case Tests for Treatment Classifier
 
@@ -236,6 +292,17 @@ def test_overlapping_and_absent_signals(classifier):
     assert neutral_signals == []
 
 
+def test_negated_signal_is_not_reported_as_positive(classifier):
+    """A negated phrase yields only the negative signal, once per context."""
+    text = "In 410 U.S. 113 the rule was not followed, and it was not followed later."
+
+    signals = classifier.extract_signals(text, "410 U.S. 113")
+
+    assert [(s.signal, s.treatment_type) for s in signals] == [
+        ("not followed", TreatmentType.NEGATIVE)
+    ]
+
+
 def test_confidence_thresholds(classifier):
     """Test confidence threshold handling at boundaries."""
     # Test critical negative threshold (0.8)
@@ -334,6 +401,33 @@ def test_signal_extraction_with_negation(classifier):
     assert any("not followed" in s.signal for s in signals)
 
 
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("410 U.S. 113 has not been followed since.", ("not followed", TreatmentType.NEGATIVE)),
+        ("410 U.S. 113 was never followed.", ("not followed", TreatmentType.NEGATIVE)),
+        ("410 U.S. 113 wasn't followed.", ("not followed", TreatmentType.NEGATIVE)),
+        ("It did not apply, but 410 U.S. 113 was followed.", ("followed", TreatmentType.POSITIVE)),
+        (
+            "Roe v. Wade, 410 U.S. 113, has not only been followed but extended.",
+            ("followed", TreatmentType.POSITIVE),
+        ),
+        (
+            "Courts that did not hesitate followed 410 U.S. 113",
+            ("followed", TreatmentType.POSITIVE),
+        ),
+    ],
+)
+def test_signal_extraction_with_separated_negation(classifier, text, expected):
+    """Only a negation directly before "followed" (optionally "been") flips it."""
+    signals = classifier.extract_signals(text, "410 U.S. 113")
+
+    assert {(s.signal, s.treatment_type) for s in signals} == {expected}
+
+    analysis = classifier.classify_treatment({"caseName": "Citing"}, "410 U.S. 113", text)
+    assert analysis.treatment_type == expected[1]
+
+
 def test_signal_extraction_weak_signals(classifier):
     """Test extraction of weaker signals."""
     # 'Distinguished' is a weaker negative signal (0.5 weight)
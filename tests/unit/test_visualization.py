@@ -76,9 +76,8 @@ def mock_mermaid_generator(mocker):
 
 @pytest.fixture
 def mock_classifier(mocker):
-    """Mock the TreatmentClassifier."""
-    classifier_mock = mocker.patch("app.tools.network.TreatmentClassifier")
-    instance = classifier_mock.return_value
+    """Mock the shared treatment classifier."""
+    instance = mocker.patch("app.tools.network.classifier")
 
     # Mock classify_treatment return value
     # It needs to return a TreatmentAnalysis object